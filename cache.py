@@ -0,0 +1,323 @@
+# cache.py
+"""
+Mémoïsation des coordonnées, indexée par le vecteur de scores empaqueté (16 octets) et la
+version du modèle.
+
+- CoordinateCache : LRU bornée en mémoire, avec un niveau persistant optionnel (SQLite).
+- batch_coordinates : chemin en lot, avec déduplication des profils identiques, recherche des
+  profils distincts dans le cache, calcul vectorisé des seuls absents, puis redistribution des
+  résultats sur toutes les lignes.
+
+Les taux de succès sont exposés par stats() pour mesurer le gain sur des données réelles.
+"""
+from __future__ import annotations
+
+import atexit
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from model import (
+    MODEL_VERSION, PRECISIONS, VARIABLES, apply_transformations_and_get_coordinates, coordinates_batch,
+    scores_to_vector,
+)
+
+# En deçà, la déduplication est toujours appliquée (coût négligeable).
+_DEDUP_ALWAYS_BELOW = 4096
+# Taille de l'échantillon servant à estimer le taux de doublons d'un grand lot.
+_DEDUP_SAMPLE = 8192
+# Part minimale de doublons (estimée sur l'échantillon) pour que la déduplication soit rentable :
+# trier N lignes coûte à peu près autant que les évaluer.
+_DEDUP_MIN_RATIO = 0.3
+
+
+# Au-delà de ce nombre de profils distincts, un lot n'est pas mémoïsé : le calcul vectorisé
+# coûte moins que les recherches ligne par ligne, et le lot viderait la LRU.
+_MEMO_MAX_ROWS = 16384
+
+
+def _key_prefix(model_version: str, variant: str = "") -> bytes:
+    return (model_version + (":" + variant if variant else "")).encode("ascii") + b":"
+
+
+def pack_key(vec: np.ndarray, model_version: str = MODEL_VERSION, variant: str = "") -> bytes:
+    """
+    Clé de cache : version du modèle + variante de calcul + 16 octets de scores.
+    variant="" : implémentation scalaire de référence, non bornée (CoordinateCache.coordinates).
+    """
+    return _key_prefix(model_version, variant) + np.asarray(vec, dtype=np.uint8).tobytes()
+
+
+def batch_variant(clamp: bool, precision: str) -> str:
+    """Variante de clé des résultats de coordinates_batch (bornage et précision changent la valeur)."""
+    return precision + ("/borne" if clamp else "")
+
+
+def _unique_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lignes distinctes d'une matrice (N, 16) uint8 : (indices d'une occurrence par groupe, inverse),
+    avec matrix == matrix[first][inverse]. Tri lexicographique sur deux mots de 64 bits.
+    """
+    words = np.ascontiguousarray(matrix, dtype=np.uint8).view("<u8")
+    order = np.lexsort((words[:, 1], words[:, 0]))
+    s = words[order]
+    new = np.empty(len(s), dtype=bool)
+    new[:1] = True
+    np.any(s[1:] != s[:-1], axis=1, out=new[1:])
+    inverse = np.empty(len(s), dtype=np.int64)
+    inverse[order] = np.cumsum(new) - 1
+    return order[new], inverse
+
+
+class CoordinateCache:
+    def __init__(self, maxsize: int = 65536, persistent_path: Optional[str] = None,
+                 model_version: str = MODEL_VERSION):
+        self.maxsize = maxsize
+        self.model_version = model_version
+        self._lru: "OrderedDict[bytes, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.batch_rows = 0
+        self.batch_unique = 0
+        self.batch_deduplicated = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._pending: Dict[bytes, Tuple[float, float]] = {}  # écritures SQLite en attente
+        if persistent_path:
+            self._db = sqlite3.connect(persistent_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS coords (key BLOB PRIMARY KEY, x REAL NOT NULL, y REAL NOT NULL)"
+            )
+            self._db.commit()
+            # Sans fermeture explicite, les dernières entrées en attente seraient perdues
+            atexit.register(self.close)
+
+    # ---------- une personne ----------
+
+    def coordinates(self, scores: Dict[str, int]) -> Tuple[float, float]:
+        """Coordonnées (x, y) non bornées d'un dict de scores, via le cache."""
+        vec = scores_to_vector(scores)
+        key = pack_key(vec, self.model_version)
+        with self._lock:
+            xy = self._lru.get(key)
+            if xy is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return xy
+
+        xy = self._persistent_get(key)
+        if xy is not None:
+            self.persistent_hits += 1
+            self._lru_put(key, xy)
+        else:
+            self.misses += 1
+            xy = apply_transformations_and_get_coordinates(scores)
+            self.put(key, xy)
+        return xy
+
+    def put(self, key: bytes, xy: Tuple[float, float]):
+        self._lru_put(key, xy)
+        self._persistent_put(key, xy)
+
+    def _lru_put(self, key: bytes, xy: Tuple[float, float]):
+        with self._lock:
+            self._lru[key] = xy
+            self._lru.move_to_end(key)
+            if len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+    # ---------- lots ----------
+
+    def lookup_many(self, keys: Sequence[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recherche (LRU puis niveau persistant) d'une liste de clés.
+        Retourne (masque des clés trouvées, coordonnées (n, 2) float64, NaN si absentes).
+        """
+        n = len(keys)
+        found = np.zeros(n, dtype=bool)
+        out = np.full((n, 2), np.nan)
+        missing: List[int] = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                xy = self._lru.get(key)
+                if xy is None:
+                    missing.append(i)
+                else:
+                    self._lru.move_to_end(key)
+                    out[i] = xy
+                    found[i] = True
+            self.hits += n - len(missing)
+
+        if missing and self._db is not None:
+            rows = self._persistent_get_many([keys[i] for i in missing])
+            still: List[int] = []
+            for i in missing:
+                xy = rows.get(keys[i])
+                if xy is None:
+                    still.append(i)
+                else:
+                    out[i] = xy
+                    found[i] = True
+                    self._lru_put(keys[i], xy)
+            with self._lock:
+                self.persistent_hits += len(missing) - len(still)
+            missing = still
+
+        with self._lock:
+            self.misses += len(missing)
+        return found, out
+
+    def put_many(self, keys: Sequence[bytes], coords: np.ndarray):
+        items = list(zip(keys, map(tuple, np.asarray(coords, dtype=np.float64).tolist())))
+        with self._lock:
+            for key, xy in items:
+                self._lru[key] = xy
+                self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+            if self._db is not None:
+                self._pending.update(items)
+                if len(self._pending) >= 256:
+                    self._flush_locked()
+
+    def record_batch(self, rows: int, unique: int, dedup: bool):
+        """Compteurs de déduplication d'un appel à batch_coordinates."""
+        with self._lock:
+            self.batch_rows += rows
+            if dedup:
+                self.batch_deduplicated += rows
+                self.batch_unique += unique
+
+    # ---------- niveau persistant ----------
+
+    def _persistent_get(self, key: bytes) -> Optional[Tuple[float, float]]:
+        if self._db is None:
+            return None
+        with self._lock:
+            xy = self._pending.get(key)
+            if xy is not None:
+                return xy
+            row = self._db.execute("SELECT x, y FROM coords WHERE key = ?", (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _persistent_get_many(self, keys: Sequence[bytes]) -> Dict[bytes, Tuple[float, float]]:
+        found: Dict[bytes, Tuple[float, float]] = {}
+        with self._lock:
+            for key in keys:
+                xy = self._pending.get(key)
+                if xy is not None:
+                    found[key] = xy
+            rest = [k for k in keys if k not in found]
+            # Limite de paramètres par requête SQLite
+            for start in range(0, len(rest), 500):
+                part = rest[start:start + 500]
+                sql = "SELECT key, x, y FROM coords WHERE key IN (%s)" % ",".join("?" * len(part))
+                for key, x, y in self._db.execute(sql, part):
+                    found[bytes(key)] = (x, y)
+        return found
+
+    def _persistent_put(self, key: bytes, xy: Tuple[float, float]):
+        if self._db is None:
+            return
+        with self._lock:
+            self._pending[key] = xy
+            if len(self._pending) >= 256:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._db is not None and self._pending:
+            self._db.executemany("INSERT OR REPLACE INTO coords (key, x, y) VALUES (?, ?, ?)",
+                                 [(k, x, y) for k, (x, y) in self._pending.items()])
+            self._db.commit()
+            self._pending.clear()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        self.flush()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            atexit.unregister(self.close)
+
+    # ---------- statistiques ----------
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "entries": len(self._lru),
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": ((self.hits + self.persistent_hits) / lookups) if lookups else 0.0,
+            "batch_rows": self.batch_rows,
+            "batch_unique": self.batch_unique,
+            "batch_dedup_rate": (1.0 - self.batch_unique / self.batch_deduplicated) if self.batch_deduplicated else 0.0,
+        }
+
+
+def batch_coordinates(matrix: np.ndarray, clamp: bool = False, dedup: Optional[bool] = None,
+                      cache: Optional[CoordinateCache] = None, precision: str = "float64") -> np.ndarray:
+    """
+    coordinates_batch avec déduplication préalable des profils identiques.
+
+    dedup=None : automatique (toujours pour les petits lots, sinon si un échantillon montre
+    au moins _DEDUP_MIN_RATIO de doublons). precision : voir model.PRECISIONS.
+
+    cache : les profils distincts du lot (au plus _MEMO_MAX_ROWS) sont cherchés dans le cache,
+    seuls les absents sont calculés puis ajoutés ; la clé inclut clamp et precision.
+    """
+    m = np.asarray(matrix, dtype=np.uint8)
+    if m.ndim != 2 or m.shape[1] != len(VARIABLES):
+        raise ValueError(f"Matrice de scores attendue de forme (N, {len(VARIABLES)}), reçu {m.shape}")
+    n = len(m)
+
+    if dedup is None:
+        if n <= _DEDUP_ALWAYS_BELOW:
+            dedup = True
+        else:
+            size = min(n, _DEDUP_SAMPLE)
+            sample = m[np.random.default_rng(0).choice(n, size, replace=False)]
+            first, _ = _unique_rows(sample)
+            dedup = 1.0 - len(first) / size >= _DEDUP_MIN_RATIO
+
+    if dedup and n:
+        first, inverse = _unique_rows(m)
+        rows = m[first]
+    else:
+        inverse = None
+        rows = m
+    unique = len(rows)
+
+    if cache is not None and 0 < unique <= _MEMO_MAX_ROWS:
+        prefix = _key_prefix(cache.model_version, batch_variant(clamp, precision))
+        blob = np.ascontiguousarray(rows).tobytes()
+        width = len(VARIABLES)
+        keys = [prefix + blob[i:i + width] for i in range(0, len(blob), width)]
+        found, known = cache.lookup_many(keys)
+        out = known.astype(PRECISIONS[precision])
+        miss = np.flatnonzero(~found)
+        if len(miss):
+            computed = coordinates_batch(rows[miss], clamp=clamp, precision=precision)
+            out[miss] = computed
+            cache.put_many([keys[i] for i in miss.tolist()], computed)
+    else:
+        out = coordinates_batch(rows, clamp=clamp, precision=precision)
+
+    if inverse is not None:
+        out = out[inverse]
+    if cache is not None:
+        cache.record_batch(n, unique, bool(dedup))
+    return out
+
+
+# Cache partagé par l'application (mémoire seule par défaut).
+default_cache = CoordinateCache()
@@ -0,0 +1,371 @@
+# export.py
+"""
+Export des personnes (prénom, 16 scores, coordonnées, personnalités les plus proches).
+
+Formats, choisis d'après l'extension :
+  - .csv / .csv.gz      : une ligne par personne (séparateur virgule, en-tête) ;
+  - .jsonl / .jsonl.gz  : un objet JSON par ligne ;
+  - .psc                : format binaire en colonnes, compressé par blocs (zlib).
+
+L'écriture se fait bloc par bloc (CHUNK_ROWS lignes) : la mémoire utilisée ne dépend pas du
+nombre de personnes. La compression des blocs (membres gzip successifs pour .gz, colonnes
+zlib pour .psc) peut être répartie sur plusieurs threads, l'ordre d'écriture étant conservé.
+
+Format .psc :
+
+    b"PSCX" | u16 version | blocs (une colonne compressée après l'autre) | en-tête JSON | u64 position de l'en-tête | b"PSCX"
+
+L'en-tête décrit les colonnes (nom, type NumPy), la liste des personnalités référencées par
+les colonnes proche_i et la position des blocs ; ColumnarReader relit une colonne sans
+décompresser les autres.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+import struct
+import tempfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from model import MODEL_VERSION, VARIABLES, people_to_arrays
+from personalities_data import PersonalityPoint, nearest_personalities_batch, unique_personalities
+
+
+CHUNK_ROWS = 65536
+DEFAULT_NEAREST = 3
+
+MAGIC = b"PSCX"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<4sH")
+_FOOTER = struct.Struct("<Q4s")
+
+Chunk = Tuple[Sequence[str], np.ndarray, np.ndarray]
+
+# ============================================================
+#  SOURCES
+# ============================================================
+
+def iter_people_chunks(people: Sequence[dict], chunk_rows: int = CHUNK_ROWS) -> Iterator[Chunk]:
+    """Blocs (prénoms, scores (n, 16), coordonnées (n, 2)) depuis people_data, sans tout convertir d'un coup."""
+    for start in range(0, len(people), chunk_rows):
+        yield people_to_arrays(people[start:start + chunk_rows])
+
+
+def iter_array_chunks(names: Sequence[str], scores: np.ndarray, coords: np.ndarray,
+                      chunk_rows: int = CHUNK_ROWS) -> Iterator[Chunk]:
+    for start in range(0, len(names), chunk_rows):
+        end = start + chunk_rows
+        yield names[start:end], scores[start:end], coords[start:end]
+
+
+def format_for_path(path: str) -> Tuple[str, bool]:
+    """(format, compression gzip) d'après l'extension."""
+    lower = path.lower()
+    gz = lower.endswith(".gz")
+    if gz:
+        lower = lower[:-3]
+    for ext, fmt in ((".csv", "csv"), (".jsonl", "jsonl"), (".psc", "columnar")):
+        if lower.endswith(ext):
+            if gz and fmt == "columnar":
+                break
+            return fmt, gz
+    raise ValueError(f"Format d'export non reconnu : {os.path.basename(path)} (.csv, .jsonl, .gz, .psc)")
+
+
+# ============================================================
+#  COMPRESSION ORDONNÉE EN PARALLÈLE
+# ============================================================
+
+class _OrderedWriter:
+    """
+    Écrit des blocs dans l'ordre de soumission ; la transformation (compression) est faite
+    sur un pool de threads (zlib libère le GIL). Au plus `max_inflight` blocs en mémoire.
+    """
+
+    def __init__(self, fh, transform: Callable[[Any], List[bytes]], workers: int = 0,
+                 on_written: Optional[Callable[[Any, List[bytes], int], None]] = None):
+        self.fh = fh
+        self.transform = transform
+        self.on_written = on_written
+        self._pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        self._max_inflight = 2 * workers
+        self._inflight: Deque[Tuple[Any, Future]] = deque()
+
+    def submit(self, item: Any):
+        if self._pool is None:
+            self._write(item, self.transform(item))
+            return
+        self._inflight.append((item, self._pool.submit(self.transform, item)))
+        while len(self._inflight) > self._max_inflight:
+            self._drain_one()
+
+    def _drain_one(self):
+        item, fut = self._inflight.popleft()
+        self._write(item, fut.result())
+
+    def _write(self, item: Any, blocks: List[bytes]):
+        offset = self.fh.tell()
+        for b in blocks:
+            self.fh.write(b)
+        if self.on_written is not None:
+            self.on_written(item, blocks, offset)
+
+    def close(self):
+        try:
+            while self._inflight:
+                self._drain_one()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ============================================================
+#  FORMATS TEXTE
+# ============================================================
+
+def _columns(k: int) -> List[str]:
+    cols = ["name", *VARIABLES, "x", "y"]
+    for i in range(1, k + 1):
+        cols += [f"proche_{i}", f"distance_{i}"]
+    return cols
+
+
+def _csv_field(s: str) -> str:
+    if any(c in s for c in ',"\r\n'):
+        return '"' + s.replace('"', '""') + '"'
+    return s
+
+
+_JSON_SAFE = re.compile(r'[^"\\\x00-\x1f]*\Z')
+
+
+def _json_str(s: str) -> str:
+    return '"' + s + '"' if _JSON_SAFE.match(s) else json.dumps(s, ensure_ascii=False)
+
+
+# Une chaîne de format par ligne : un seul formatage % par personne
+def _csv_template(k: int) -> str:
+    return ",".join(["%s"] + ["%d"] * len(VARIABLES) + ["%.6f", "%.6f"] + ["%s", "%.4f"] * k) + "\n"
+
+
+def _jsonl_template(k: int) -> str:
+    fields = ", ".join(f"{json.dumps(v)}: %d" for v in VARIABLES)
+    line = '{"name": %s, "scores": {' + fields + '}, "x": %.6f, "y": %.6f'
+    if k:
+        line += ', "nearest": [' + ", ".join(['{"name": %s, "distance": %.4f}'] * k) + "]"
+    return line + "}\n"
+
+
+def _render(template: str, quote: Callable[[str], str], names, scores, coords, near_names, near_dist) -> str:
+    cols: List[list] = [[quote(n) for n in names]]
+    cols += scores.T.tolist()
+    cols += coords.T.tolist()
+    for j in range(near_dist.shape[1]):
+        cols.append([quote(n) for n in near_names[j]])
+        cols.append(near_dist[:, j].tolist())
+    return "".join([template % row for row in zip(*cols)])
+
+
+# ============================================================
+#  EXPORT
+# ============================================================
+
+def export_people(path: str, chunks: Iterable[Chunk], nearest: int = DEFAULT_NEAREST,
+                  personalities: Optional[Sequence[PersonalityPoint]] = None,
+                  workers: int = 0, level: int = 6,
+                  progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Exporte des blocs (prénoms, scores, coordonnées) vers `path` ; format d'après l'extension.
+
+    nearest : nombre de personnalités les plus proches ajoutées par personne (0 = aucune).
+    workers : threads de compression (0 ou 1 = compression dans le thread appelant).
+    Écriture atomique (fichier temporaire puis remplacement). Retourne le nombre de lignes.
+    """
+    fmt, gz = format_for_path(path)
+    # Base dédoublonnée par nom (comme nearest_personalities_batch) avant de borner `nearest` :
+    # le nombre de colonnes déclarées doit être celui effectivement écrit.
+    pts = unique_personalities(personalities)
+    nearest = max(0, min(int(nearest), len(pts)))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            if fmt == "columnar":
+                total = _write_columnar(fh, chunks, nearest, pts, workers, level, progress)
+            else:
+                total = _write_text(fh, fmt, gz, chunks, nearest, pts, workers, level, progress)
+        _set_shared_mode(tmp, path)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return total
+
+
+def _set_shared_mode(tmp: str, path: str):
+    """
+    mkstemp crée le fichier en 0600 : on reprend les droits du fichier remplacé s'il existe,
+    sinon les droits par défaut (0666 moins le umask), les exports étant destinés à être partagés.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(tmp, mode)
+
+
+def _nearest(coords: np.ndarray, k: int, pts: Sequence[PersonalityPoint]) -> Tuple[List[PersonalityPoint], np.ndarray, np.ndarray]:
+    """pts est déjà dédoublonné et k <= len(pts) : indices et distances ont toujours k colonnes."""
+    if k == 0 or len(coords) == 0:
+        return list(pts), np.zeros((len(coords), k), dtype=np.int64), np.zeros((len(coords), k))
+    return nearest_personalities_batch(coords, k, pts)
+
+
+def _write_text(fh, fmt: str, gz: bool, chunks: Iterable[Chunk], k: int, pts, workers: int, level: int,
+                progress) -> int:
+    if fmt == "csv":
+        template, quote = _csv_template(k), _csv_field
+    else:
+        template, quote = _jsonl_template(k), _json_str
+
+    def encode(text: str) -> List[bytes]:
+        data = text.encode("utf-8")
+        # Un membre gzip par bloc : la concaténation reste un fichier .gz valide
+        return [gzip.compress(data, compresslevel=level, mtime=0) if gz else data]
+
+    writer = _OrderedWriter(fh, lambda item: encode(_render(template, quote, *item)), workers)
+    total = 0
+    try:
+        if fmt == "csv":
+            header = ",".join(_csv_field(c) for c in _columns(k)) + "\n"
+            fh.write(encode(header)[0])
+        for names, scores, coords in chunks:
+            uniq, idx, dist = _nearest(coords, k, pts)
+            near_names = [[uniq[i].name for i in idx[:, j].tolist()] for j in range(idx.shape[1])]
+            writer.submit((list(names), np.asarray(scores, dtype=np.uint8), np.asarray(coords, dtype=np.float64),
+                           near_names, dist))
+            total += len(names)
+            if progress is not None:
+                progress(total)
+    finally:
+        writer.close()
+    return total
+
+
+def _write_columnar(fh, chunks: Iterable[Chunk], k: int, pts, workers: int, level: int, progress) -> int:
+    fh.write(_PREFIX.pack(MAGIC, FORMAT_VERSION))
+    columns: List[Dict[str, str]] = [{"name": "name", "dtype": "utf8"}]
+    columns += [{"name": v, "dtype": "|u1"} for v in VARIABLES]
+    columns += [{"name": "x", "dtype": "<f8"}, {"name": "y", "dtype": "<f8"}]
+    for i in range(1, k + 1):
+        columns += [{"name": f"proche_{i}", "dtype": "<u2"}, {"name": f"distance_{i}", "dtype": "<f4"}]
+
+    chunk_info: List[dict] = []
+    uniq_names: List[str] = [p.name for p in pts] if k else []
+
+    def encode(item) -> List[bytes]:
+        names, scores, coords, idx, dist = item
+        raw = ["\0".join(names).encode("utf-8")]
+        raw += [np.ascontiguousarray(col).tobytes() for col in scores.T]
+        raw += [np.ascontiguousarray(coords[:, 0], dtype="<f8").tobytes(),
+                np.ascontiguousarray(coords[:, 1], dtype="<f8").tobytes()]
+        for j in range(idx.shape[1]):
+            raw += [idx[:, j].astype("<u2").tobytes(), dist[:, j].astype("<f4").tobytes()]
+        return [zlib.compress(b, level) for b in raw]
+
+    def record(item, blocks, offset):
+        chunk_info.append({"offset": offset, "rows": len(item[0]), "sizes": [len(b) for b in blocks]})
+
+    writer = _OrderedWriter(fh, encode, workers, on_written=record)
+    total = 0
+    try:
+        for names, scores, coords in chunks:
+            _, idx, dist = _nearest(coords, k, pts)
+            writer.submit((list(names), np.asarray(scores, dtype=np.uint8), np.asarray(coords, dtype=np.float64),
+                           idx, dist))
+            total += len(names)
+            if progress is not None:
+                progress(total)
+    finally:
+        writer.close()
+
+    header = {
+        "model_version": MODEL_VERSION,
+        "count": total,
+        "columns": columns,
+        "personalities": uniq_names,
+        "chunks": chunk_info,
+    }
+    header_offset = fh.tell()
+    fh.write(json.dumps(header, ensure_ascii=False).encode("utf-8"))
+    fh.write(_FOOTER.pack(header_offset, MAGIC))
+    return total
+
+
+# ============================================================
+#  RELECTURE DU FORMAT EN COLONNES
+# ============================================================
+
+class ColumnarReader:
+    """Lecture d'un fichier .psc : en-tête d'abord, puis colonnes décompressées à la demande."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fh:
+            magic, version = _PREFIX.unpack(fh.read(_PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError("Ce fichier n'est pas un export Politiscales (.psc).")
+            if version > FORMAT_VERSION:
+                raise ValueError(f"Format d'export v{version} non pris en charge (max v{FORMAT_VERSION}).")
+            fh.seek(-_FOOTER.size, os.SEEK_END)
+            footer_pos = fh.tell()
+            header_offset, end_magic = _FOOTER.unpack(fh.read(_FOOTER.size))
+            if end_magic != MAGIC:
+                raise ValueError("Export tronqué ou corrompu.")
+            fh.seek(header_offset)
+            self.header: Dict[str, Any] = json.loads(fh.read(footer_pos - header_offset).decode("utf-8"))
+        self._index = {c["name"]: i for i, c in enumerate(self.header["columns"])}
+
+    @property
+    def count(self) -> int:
+        return int(self.header["count"])
+
+    @property
+    def columns(self) -> List[str]:
+        return [c["name"] for c in self.header["columns"]]
+
+    def _decode(self, j: int, raw: bytes, rows: int):
+        dtype = self.header["columns"][j]["dtype"]
+        if dtype == "utf8":
+            return raw.decode("utf-8").split("\0") if rows else []
+        return np.frombuffer(raw, dtype=dtype)
+
+    def iter_chunks(self, columns: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+        wanted = [self._index[c] for c in (columns or self.columns)]
+        with open(self.path, "rb") as fh:
+            for info in self.header["chunks"]:
+                starts = np.concatenate([[0], np.cumsum(info["sizes"])]) + info["offset"]
+                out = {}
+                for j in wanted:
+                    fh.seek(int(starts[j]))
+                    raw = zlib.decompress(fh.read(info["sizes"][j]))
+                    out[self.header["columns"][j]["name"]] = self._decode(j, raw, info["rows"])
+                yield out
+
+    def read_column(self, name: str):
+        parts = [c[name] for c in self.iter_chunks([name])]
+        if self.header["columns"][self._index[name]]["dtype"] == "utf8":
+            return [s for p in parts for s in p]
+        return np.concatenate(parts) if parts else np.zeros(0)
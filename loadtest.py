@@ -0,0 +1,120 @@
+# loadtest.py
+"""
+Test de charge du service local (server.py).
+
+Ouvre `--concurrency` connexions keep-alive, envoie `--requests` requêtes au total
+et affiche le débit ainsi que les percentiles de latence.
+
+Exemple : python loadtest.py --endpoint score --concurrency 64 --requests 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Tuple
+
+from model import VARIABLES
+
+
+def _random_profile(rng: random.Random) -> Dict[str, int]:
+    return {k: rng.randint(0, 100) for k in VARIABLES}
+
+
+def _build_body(endpoint: str, rng: random.Random, batch_size: int) -> Tuple[str, bytes]:
+    if endpoint == "score":
+        return "/score", json.dumps({"scores": _random_profile(rng)}).encode()
+    if endpoint == "batch":
+        profiles = [_random_profile(rng) for _ in range(batch_size)]
+        return "/score/batch", json.dumps({"profiles": profiles}).encode()
+    if endpoint == "nearest":
+        return "/nearest", json.dumps({"scores": _random_profile(rng), "k": 5}).encode()
+    raise ValueError(f"Endpoint inconnu : {endpoint}")
+
+
+async def _request(reader, writer, host: str, path: str, body: bytes) -> int:
+    writer.write(
+        (
+            f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1")
+        + body
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        if k.strip().lower() == "content-length":
+            length = int(v)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host: str, port: int, endpoint: str, batch_size: int, counter: List[int],
+                  total: int, latencies: List[float], statuses: Dict[int, int], seed: int):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] < total:
+            counter[0] += 1
+            path, body = _build_body(endpoint, rng, batch_size)
+            t0 = time.perf_counter()
+            status = await _request(reader, writer, host, path, body)
+            latencies.append(time.perf_counter() - t0)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, max(0, int(round(q / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[i]
+
+
+async def run(host: str, port: int, endpoint: str, concurrency: int, total: int, batch_size: int):
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    counter = [0]
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*[
+        _client(host, port, endpoint, batch_size, counter, total, latencies, statuses, seed=i)
+        for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - t0
+
+    lat = sorted(latencies)
+    rows = len(lat) * (batch_size if endpoint == "batch" else 1)
+    print(f"Endpoint        : /{endpoint}  (concurrence={concurrency})")
+    print(f"Requêtes        : {len(lat)} en {elapsed:.2f} s")
+    print(f"Débit           : {len(lat) / elapsed:,.0f} req/s  ({rows / elapsed:,.0f} profils/s)")
+    print(f"Statuts HTTP    : {dict(sorted(statuses.items()))}")
+    print("Latence (ms)    : " + "  ".join(
+        f"p{q}={_percentile(lat, q) * 1000:.2f}" for q in (50, 90, 95, 99)
+    ) + f"  max={lat[-1] * 1000 if lat else 0.0:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du service Politiscales")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--endpoint", choices=["score", "batch", "nearest"], default="score")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=100, help="profils par requête (endpoint batch)")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.host, args.port, args.endpoint, args.concurrency, args.requests, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
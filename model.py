@@ -0,0 +1,252 @@
+# model.py
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+
+# ============================================================
+#  VARIABLES DU MODÈLE
+# ============================================================
+
+# Ordre canonique des 16 variables (paires de pôles opposés consécutives).
+VARIABLES: Tuple[str, ...] = (
+    "constructivisme", "essentialisme",
+    "justice_rehabilitative", "justice_punitive",
+    "progressisme", "conservatisme",
+    "internationalisme", "nationalisme",
+    "communisme", "capitalisme",
+    "regulation", "laissez_faire",
+    "ecologie", "productivisme",
+    "revolution", "reformisme",
+)
+
+# Paires (pôle A, pôle B) sous forme d'indices dans VARIABLES.
+PAIRS: Tuple[Tuple[int, int], ...] = tuple((i, i + 1) for i in range(0, len(VARIABLES), 2))
+
+# Version du modèle de coordonnées : à incrémenter dès que les transformations changent,
+# pour invalider les coordonnées sauvegardées (sessions, caches).
+MODEL_VERSION = "1"
+
+# Le plan politique est borné à [-PLANE_LIMIT, PLANE_LIMIT] sur les deux axes.
+PLANE_LIMIT = 4.0
+
+_INDEX = {name: i for i, name in enumerate(VARIABLES)}
+
+
+# ============================================================
+#  TRANSFORMATIONS (version scalaire)
+# ============================================================
+
+def log_transform(v: float, alpha: float = 1.0) -> float:
+    """
+    Logarithme : T(v) = ln(1 + alpha * v)
+    v est supposé normalisé dans [0,1].
+    """
+    if v <= 0:
+        return 0.0
+    return math.log(1 + alpha * v)
+
+
+def power_transform(v: float, beta: float = 1.2) -> float:
+    """
+    Puissance : T(v) = v^beta
+    v est supposé normalisé dans [0,1].
+    """
+    return v ** beta
+
+
+def sigmoid_transform(v: float, a: float = 1.0, b: float = 0.5) -> float:
+    """
+    Sigmoïde : T(v) = 1 / (1 + e^(-a * (v - b)))
+    v est supposé normalisé dans [0,1].
+    """
+    return 1.0 / (1.0 + math.exp(-a * (v - b)))
+
+
+def ratio_transform(v1: float, v2: float, k: float = 1.0) -> float:
+    """
+    Ratio pondéré : T(v1, v2) = v1 / (1 + k * v2)
+    Permet d'éviter qu'une seule variable ne domine.
+    """
+    return v1 / (1.0 + k * v2)
+
+
+def absolute_distance(a: float, b: float) -> float:
+    """Distance absolue : |a - b|"""
+    return abs(a - b)
+
+
+# ============================================================
+#  COORDONNÉES (x, y) — UNE PERSONNE
+# ============================================================
+
+def apply_transformations_and_get_coordinates(scores: Dict[str, int]) -> Tuple[float, float]:
+    """
+    Reçoit un dict 'scores' avec les 16 clés de VARIABLES (0..100) et retourne (x, y).
+
+    Étapes :
+    1) Normalisation [0..1]
+    2) Transformations (log, puissance, sigmoïde, ratio)
+    3) Combinaisons pour axe économique (x) et axe sociétal (y)
+    4) Interactions via distance absolue
+    """
+    cstr = scores["constructivisme"] / 100.0
+    ess = scores["essentialisme"] / 100.0
+    jreh = scores["justice_rehabilitative"] / 100.0
+    jpun = scores["justice_punitive"] / 100.0
+    prog = scores["progressisme"] / 100.0
+    cons = scores["conservatisme"] / 100.0
+    inter = scores["internationalisme"] / 100.0
+    nat = scores["nationalisme"] / 100.0
+    comm = scores["communisme"] / 100.0
+    capi = scores["capitalisme"] / 100.0
+    reg = scores["regulation"] / 100.0
+    lais = scores["laissez_faire"] / 100.0
+    ecol = scores["ecologie"] / 100.0
+    prod = scores["productivisme"] / 100.0
+    revo = scores["revolution"] / 100.0
+    refor = scores["reformisme"] / 100.0
+
+    # Axe économique (x)
+    comm_t = power_transform(comm, beta=1.3)
+    capi_t = log_transform(capi, alpha=1.2)
+    reg_t = sigmoid_transform(reg, a=1.0, b=0.5)
+    lais_t = ratio_transform(lais, reg, k=0.8)
+    ecol_t = sigmoid_transform(ecol, a=1.2, b=0.4)
+    prod_t = power_transform(prod, beta=1.2)
+    revo_t = power_transform(revo, beta=1.3)
+    refor_t = ratio_transform(refor, revo, k=0.5)
+
+    # Axe sociétal (y)
+    cstr_t = sigmoid_transform(cstr, a=1.2, b=0.5)
+    ess_t = log_transform(ess, alpha=1.5)
+    jreh_t = log_transform(jreh, alpha=1.0)
+    jpun_t = power_transform(jpun, beta=1.2)
+    prog_t = sigmoid_transform(prog, a=1.0, b=0.5)
+    cons_t = power_transform(cons, beta=1.2)
+    inter_t = log_transform(inter, alpha=1.3)
+    nat_t = power_transform(nat, beta=1.3)
+
+    x_base = (capi_t - comm_t) + (lais_t - reg_t) + (prod_t - ecol_t) + (refor_t - revo_t)
+    y_base = (cstr_t - ess_t) + (jreh_t - jpun_t) + (prog_t - cons_t) + (inter_t - nat_t)
+
+    # Interactions via distance absolue
+    x = x_base + 0.3 * absolute_distance(comm_t, capi_t)
+    y = y_base + 0.2 * absolute_distance(prog_t, cons_t)
+
+    return (x, y)
+
+
+# ============================================================
+#  COORDONNÉES (x, y) — VERSION VECTORISÉE
+# ============================================================
+
+def scores_to_vector(scores: Dict[str, int]) -> np.ndarray:
+    """Dict de scores -> vecteur uint8 de 16 valeurs, dans l'ordre de VARIABLES."""
+    return np.fromiter((scores[k] for k in VARIABLES), dtype=np.uint8, count=len(VARIABLES))
+
+
+def scores_to_matrix(rows: Iterable[Dict[str, int]]) -> np.ndarray:
+    """Liste de dicts de scores -> matrice (N, 16) uint8."""
+    rows = list(rows)
+    out = np.empty((len(rows), len(VARIABLES)), dtype=np.uint8)
+    for i, scores in enumerate(rows):
+        out[i] = [scores[k] for k in VARIABLES]
+    return out
+
+
+def vector_to_scores(vec: Sequence[int]) -> Dict[str, int]:
+    """Vecteur de 16 scores -> dict {variable: score}."""
+    return {k: int(v) for k, v in zip(VARIABLES, vec)}
+
+
+# Précisions de calcul de coordinates_batch. float32 divise par deux la mémoire et la bande
+# passante des grands lots ; l'écart au calcul scalaire (math, float64) est mesuré par precision.py.
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+
+# En float32, les lignes dont |x| ou |y| est sous ce seuil sont recalculées avec l'implémentation
+# scalaire de référence : l'erreur float32 (< 1e-5 sur le corpus de precision.py) ne peut donc
+# jamais changer le quadrant d'une personne.
+QUADRANT_GUARD = 1e-4
+
+
+def _coordinates(m: np.ndarray, dtype) -> np.ndarray:
+    v = m.astype(dtype) / dtype(100.0)
+    col = lambda name: v[:, _INDEX[name]]
+    c = lambda value: dtype(value)
+
+    def sig(a_: np.ndarray, a: float, b: float) -> np.ndarray:
+        return c(1.0) / (c(1.0) + np.exp(-c(a) * (a_ - c(b))))
+
+    comm_t = col("communisme") ** c(1.3)
+    capi_t = np.log1p(c(1.2) * col("capitalisme"))
+    reg_t = sig(col("regulation"), 1.0, 0.5)
+    lais_t = col("laissez_faire") / (c(1.0) + c(0.8) * col("regulation"))
+    ecol_t = sig(col("ecologie"), 1.2, 0.4)
+    prod_t = col("productivisme") ** c(1.2)
+    revo_t = col("revolution") ** c(1.3)
+    refor_t = col("reformisme") / (c(1.0) + c(0.5) * col("revolution"))
+
+    cstr_t = sig(col("constructivisme"), 1.2, 0.5)
+    ess_t = np.log1p(c(1.5) * col("essentialisme"))
+    jreh_t = np.log1p(col("justice_rehabilitative"))
+    jpun_t = col("justice_punitive") ** c(1.2)
+    prog_t = sig(col("progressisme"), 1.0, 0.5)
+    cons_t = col("conservatisme") ** c(1.2)
+    inter_t = np.log1p(c(1.3) * col("internationalisme"))
+    nat_t = col("nationalisme") ** c(1.3)
+
+    out = np.empty((m.shape[0], 2), dtype=dtype)
+    out[:, 0] = (capi_t - comm_t) + (lais_t - reg_t) + (prod_t - ecol_t) + (refor_t - revo_t) \
+        + c(0.3) * np.abs(comm_t - capi_t)
+    out[:, 1] = (cstr_t - ess_t) + (jreh_t - jpun_t) + (prog_t - cons_t) + (inter_t - nat_t) \
+        + c(0.2) * np.abs(prog_t - cons_t)
+    return out
+
+
+def coordinates_batch(matrix: np.ndarray, clamp: bool = False, precision: str = "float64") -> np.ndarray:
+    """
+    Version vectorisée de apply_transformations_and_get_coordinates.
+
+    matrix : tableau (N, 16) de scores 0..100 dans l'ordre de VARIABLES.
+    precision : "float64" (défaut) ou "float32" ; le tableau retourné a ce type.
+    Retourne un tableau (N, 2) de coordonnées (x, y),
+    bornées à [-PLANE_LIMIT, PLANE_LIMIT] si clamp=True.
+    """
+    m = np.asarray(matrix)
+    if m.ndim != 2 or m.shape[1] != len(VARIABLES):
+        raise ValueError(f"Matrice de scores attendue de forme (N, {len(VARIABLES)}), reçu {m.shape}")
+    try:
+        dtype = PRECISIONS[precision]
+    except KeyError:
+        raise ValueError(f"Précision inconnue : {precision} (attendu : {', '.join(PRECISIONS)})") from None
+
+    out = _coordinates(m, dtype)
+    if dtype is not np.float64:
+        # Bande de garde autour des axes : quadrants identiques à l'implémentation de référence
+        near_axis = np.flatnonzero((np.abs(out) < QUADRANT_GUARD).any(axis=1))
+        for i in near_axis.tolist():
+            out[i] = apply_transformations_and_get_coordinates(vector_to_scores(m[i]))
+
+    if clamp:
+        np.clip(out, -PLANE_LIMIT, PLANE_LIMIT, out=out)
+    return out
+
+
+def people_from_arrays(names: Sequence[str], matrix: np.ndarray, coords: np.ndarray) -> List[dict]:
+    """Construit la liste people_data ({name, scores, x, y}) utilisée par l'interface."""
+    return [
+        {"name": name, "scores": vector_to_scores(row), "x": float(xy[0]), "y": float(xy[1])}
+        for name, row, xy in zip(names, matrix, coords)
+    ]
+
+
+def people_to_arrays(people: Sequence[dict]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Inverse de people_from_arrays : (prénoms, scores (N, 16) uint8, coordonnées (N, 2))."""
+    names = [p["name"] for p in people]
+    matrix = scores_to_matrix(p["scores"] for p in people)
+    coords = np.array([(p["x"], p["y"]) for p in people], dtype=np.float64).reshape(-1, 2)
+    return names, matrix, coords
@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -13,6 +15,9 @@ class PersonalityPoint:
     y: float
     ux: float = 0.45  # demi-largeur ellipse
     uy: float = 0.45  # demi-hauteur ellipse
+    # Profil de scores (16 valeurs dans l'ordre de model.VARIABLES), si connu :
+    # permet de placer la personnalité dans les plans ajustés (projection.py).
+    scores: Optional[Tuple[int, ...]] = None
 
 
 def get_personalities() -> List[PersonalityPoint]:
@@ -74,3 +79,50 @@ def get_personalities() -> List[PersonalityPoint]:
         P("Lénine (est.)", "Révolutionnaire", x=-2.2, y=2.6, ux=0.60, uy=0.55),
         P("Che Guevara (est.)", "Révolutionnaire", x=-1.8, y=1.6, ux=0.60, uy=0.55),
     ]
+
+
+def unique_personalities(personalities: Optional[Sequence[PersonalityPoint]] = None) -> List[PersonalityPoint]:
+    """Base sans doublons de nom (première occurrence conservée)."""
+    pts: List[PersonalityPoint] = []
+    seen = set()
+    for p in (personalities if personalities is not None else get_personalities()):
+        if p.name not in seen:
+            seen.add(p.name)
+            pts.append(p)
+    return pts
+
+
+def nearest_personalities_batch(
+    coords: np.ndarray,
+    k: int = 5,
+    personalities: Optional[Sequence[PersonalityPoint]] = None,
+) -> Tuple[List[PersonalityPoint], np.ndarray, np.ndarray]:
+    """
+    Plus proches personnalités (distance euclidienne dans le plan) pour N points.
+
+    coords : tableau (N, 2). Les doublons de nom dans la base sont ignorés.
+    Retourne (base dédoublonnée, indices (N, k), distances (N, k)), triés par distance croissante.
+    """
+    pts = unique_personalities(personalities)
+    xy = np.array([(p.x, p.y) for p in pts], dtype=np.float64)
+    c = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    k = max(1, min(int(k), len(pts)))
+
+    d2 = ((c[:, None, :] - xy[None, :, :]) ** 2).sum(axis=2)
+    idx = np.argpartition(d2, k - 1, axis=1)[:, :k]
+    part = np.take_along_axis(d2, idx, axis=1)
+    order = np.argsort(part, axis=1)
+    idx = np.take_along_axis(idx, order, axis=1)
+    dist = np.sqrt(np.take_along_axis(part, order, axis=1))
+    return pts, idx, dist
+
+
+def nearest_personalities(
+    x: float,
+    y: float,
+    k: int = 5,
+    personalities: Optional[Sequence[PersonalityPoint]] = None,
+) -> List[Tuple[PersonalityPoint, float]]:
+    """Les k personnalités les plus proches du point (x, y), avec leur distance."""
+    pts, idx, dist = nearest_personalities_batch(np.array([[x, y]]), k, personalities)
+    return [(pts[i], float(d)) for i, d in zip(idx[0], dist[0])]
@@ -0,0 +1,292 @@
+# plot_engine.py
+"""
+Dessin du plan politique, partagé entre l'interface Tk (PlotFrame) et le rendu headless (render.py).
+Les fonctions reçoivent un Axes matplotlib et n'imposent aucun backend.
+"""
+from __future__ import annotations
+
+import random
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from matplotlib.collections import EllipseCollection, LineCollection
+from matplotlib.patches import Ellipse, Rectangle
+
+from model import VARIABLES
+from personalities_data import PersonalityPoint
+
+
+FIGSIZE = (7.6, 6.8)
+STYLE = "ggplot"
+
+# Au-delà, les personnes sont dessinées en un seul nuage de points, sans prénoms.
+LABEL_LIMIT = 300
+
+# Vue par axes : au-delà de ces effectifs, bandes agrégées / image de densité
+RADAR_LIMIT = 8
+PARALLEL_LINE_LIMIT = 500
+
+
+def _clamp(v: float, lo: float, hi: float) -> float:
+    return max(lo, min(hi, v))
+
+
+AXIS_LABELS = (
+    "Économique : Gauche (x < 0)  |  Droite (x > 0)",
+    "Sociétal   : Libertaire (y < 0)  |  Autoritaire (y > 0)",
+)
+
+
+def draw_base(ax, labels: Tuple[str, str] = AXIS_LABELS):
+    """Fond du plan ; labels permet de légender un plan ajusté (projection.py)."""
+    ax.clear()
+    ax.set_xlim(-4, 4)
+    ax.set_ylim(-4, 4)
+
+    # Quadrants clairs, lisibles
+    ax.add_patch(Rectangle((-4, 0), 4, 4, color="#ffcccc", alpha=0.22, zorder=0))   # haut-gauche
+    ax.add_patch(Rectangle((0, 0), 4, 4, color="#ccffcc", alpha=0.22, zorder=0))    # haut-droit
+    ax.add_patch(Rectangle((-4, -4), 4, 4, color="#ccccff", alpha=0.22, zorder=0))  # bas-gauche
+    ax.add_patch(Rectangle((0, -4), 4, 4, color="#ffffcc", alpha=0.22, zorder=0))   # bas-droit
+
+    ax.axhline(0, color="black", linewidth=1.2, zorder=3)
+    ax.axvline(0, color="black", linewidth=1.2, zorder=3)
+    ax.grid(True, linestyle="--", alpha=0.35, zorder=1)
+
+    ax.set_xlabel(labels[0], fontsize=9)
+    ax.set_ylabel(labels[1], fontsize=9)
+
+
+def select_personalities(personalities: Sequence[PersonalityPoint], selection: str) -> List[PersonalityPoint]:
+    """Filtre de catégorie : "Aucun", "Tous" ou un nom de catégorie."""
+    selection = (selection or "Aucun").strip()
+    if selection == "Aucun":
+        return []
+    if selection == "Tous":
+        return list(personalities)
+    return [p for p in personalities if p.category.lower() == selection.lower()]
+
+
+def ellipse_half_axes(p: PersonalityPoint) -> Tuple[float, float]:
+    """Demi-axes (ux, uy) tels que dessinés : bornés pour rester lisibles."""
+    return _clamp(float(p.ux), 0.15, 1.2), _clamp(float(p.uy), 0.15, 1.2)
+
+
+def has_uncertainty(p: PersonalityPoint) -> bool:
+    """Faux pour une personnalité placée sans ellipse (ux = uy = 0, ex. dans un plan ajusté)."""
+    return p.ux > 0 and p.uy > 0
+
+
+def draw_personalities_overlay(ax, personalities: Sequence[PersonalityPoint], selection: str):
+    # Ellipses grises légères : tu peux customiser ensuite (couleur par catégorie)
+    for p in select_personalities(personalities, selection):
+        if not has_uncertainty(p):
+            ax.plot([p.x], [p.y], marker="D", markersize=4, color="gray", alpha=0.6, zorder=2)
+        else:
+            ux, uy = ellipse_half_axes(p)
+            ell = Ellipse(
+                (p.x, p.y),
+                width=2 * ux,
+                height=2 * uy,
+                alpha=0.18,
+                linewidth=1.1,
+                edgecolor="black",
+                facecolor="gray",
+                zorder=2,
+            )
+            ax.add_patch(ell)
+        ax.text(
+            p.x,
+            p.y,
+            p.name,
+            fontsize=8,
+            ha="center",
+            va="center",
+            color="black",
+            alpha=0.85,
+            zorder=4,
+        )
+
+
+def draw_people(ax, people: Sequence[dict], rng: Optional[random.Random] = None) -> list:
+    """
+    Dessine les personnes (croix + prénom). Retourne les artistes créés.
+    Au-delà de LABEL_LIMIT personnes, un seul nuage de points sans étiquettes
+    (les prénoms restent accessibles au survol dans PlotFrame).
+    """
+    rng = rng or random
+    if len(people) > LABEL_LIMIT:
+        xs = [p["x"] for p in people]
+        ys = [p["y"] for p in people]
+        colors = ["#%06x" % rng.randint(0, 0xFFFFFF) for _ in people]
+        return [ax.scatter(xs, ys, marker="x", c=colors, s=12, linewidths=1, zorder=6)]
+
+    artists = []
+    for p in people:
+        color = "#%06x" % rng.randint(0, 0xFFFFFF)
+        artists.extend(ax.plot(p["x"], p["y"], marker="x", color=color, markersize=8, linewidth=2, zorder=6))
+        artists.append(ax.text(p["x"], p["y"], " " + p["name"], color=color, fontsize=9, zorder=7))
+    return artists
+
+
+def draw_uncertainty_ellipses(ax, people: Sequence[dict], width, height, angle) -> EllipseCollection:
+    """
+    Ellipses de confiance des répondants, dans le même style que celles des personnalités.
+    Une seule collection (un seul artiste) quel que soit le nombre de personnes.
+    """
+    offsets = np.column_stack([[p["x"] for p in people], [p["y"] for p in people]]).reshape(-1, 2)
+    coll = EllipseCollection(
+        np.asarray(width, dtype=np.float64),
+        np.asarray(height, dtype=np.float64),
+        np.asarray(angle, dtype=np.float64),
+        units="xy",
+        offsets=offsets,
+        offset_transform=ax.transData,
+        alpha=0.18,
+        linewidths=1.1,
+        linestyles="--",
+        edgecolors="black",
+        facecolors="steelblue",
+        zorder=5,
+    )
+    ax.add_collection(coll, autolim=False)
+    return coll
+
+
+# ============================================================
+#  VUE PAR AXES (16 VARIABLES)
+# ============================================================
+
+_N_SCORES = 101  # scores entiers 0..100
+
+
+def column_quantiles(matrix: np.ndarray, qs: Sequence[float] = (0.25, 0.5, 0.75)) -> np.ndarray:
+    """Quantiles (len(qs), 16) de chaque variable, par histogramme des scores entiers."""
+    m = np.minimum(np.asarray(matrix), _N_SCORES - 1)
+    out = np.empty((len(qs), m.shape[1]))
+    for j in range(m.shape[1]):
+        cum = np.cumsum(np.bincount(m[:, j], minlength=_N_SCORES))
+        out[:, j] = np.searchsorted(cum, np.asarray(qs) * cum[-1])
+    return out
+
+
+def parallel_density(matrix: np.ndarray, columns_per_gap: int = 32) -> np.ndarray:
+    """
+    Image de densité (101, 15 × columns_per_gap) des coordonnées parallèles.
+
+    Entre deux axes voisins, chaque ligne ne dépend que du couple de scores (a, b) : on compte
+    les 101 × 101 couples une fois (O(N)), puis on trace chaque couple pondéré par son effectif.
+    Le coût du tracé ne dépend donc pas du nombre de personnes.
+    """
+    m = np.minimum(np.asarray(matrix), _N_SCORES - 1)
+    n_gaps = m.shape[1] - 1
+    t = (np.arange(columns_per_gap) + 0.5) / columns_per_gap
+    a = np.repeat(np.arange(_N_SCORES), _N_SCORES)
+    b = np.tile(np.arange(_N_SCORES), _N_SCORES)
+    # Ligne (en pixels de score) atteinte par chaque couple à chaque colonne, décalée par colonne
+    rows = np.rint((1.0 - t)[:, None] * a + t[:, None] * b).astype(np.intp)
+    rows += (np.arange(columns_per_gap) * _N_SCORES)[:, None]
+
+    out = np.empty((_N_SCORES, n_gaps * columns_per_gap))
+    for j in range(n_gaps):
+        pairs = np.bincount(m[:, j].astype(np.intp) * _N_SCORES + m[:, j + 1], minlength=_N_SCORES * _N_SCORES)
+        nz = np.flatnonzero(pairs)
+        dens = np.bincount(rows[:, nz].ravel(), weights=np.tile(pairs[nz], columns_per_gap),
+                           minlength=_N_SCORES * columns_per_gap)
+        out[:, j * columns_per_gap:(j + 1) * columns_per_gap] = dens.reshape(columns_per_gap, _N_SCORES).T
+    return out
+
+
+def _pair_spans(ax):
+    # Fond alterné par paire de pôles opposés
+    for i in range(0, len(VARIABLES), 4):
+        ax.axvspan(i - 0.5, i + 1.5, color="gray", alpha=0.08, zorder=0)
+
+
+def draw_parallel(ax, matrix: np.ndarray, highlight: Optional[np.ndarray] = None,
+                  density: Optional[np.ndarray] = None) -> str:
+    """
+    Coordonnées parallèles des 16 variables. Jusqu'à PARALLEL_LINE_LIMIT personnes : une seule
+    LineCollection ; au-delà : image de densité (log) (`density` permet de réutiliser un calcul).
+    Les quartiles sont toujours superposés. Retourne le mode de rendu ("lignes" ou "densité").
+    """
+    m = np.asarray(matrix)
+    n = len(m)
+    ax.clear()
+    x = np.arange(len(VARIABLES))
+    _pair_spans(ax)
+
+    mode = "lignes"
+    if n and n <= PARALLEL_LINE_LIMIT:
+        segs = np.stack([np.broadcast_to(x, m.shape), m], axis=-1).astype(np.float64)
+        ax.add_collection(LineCollection(segs, colors="steelblue", linewidths=0.8,
+                                         alpha=_clamp(20.0 / n, 0.05, 0.8), zorder=2))
+    elif n:
+        mode = "densité"
+        if density is None:
+            density = parallel_density(m)
+        ax.imshow(np.log1p(density), origin="lower", aspect="auto", cmap="Blues", interpolation="nearest",
+                  extent=(0, len(VARIABLES) - 1, -0.5, _N_SCORES - 0.5), zorder=1)
+
+    if n:
+        q1, med, q3 = column_quantiles(m)
+        ax.plot(x, q1, color="darkorange", linewidth=1.2, linestyle="--", zorder=3, label="Q1 / Q3")
+        ax.plot(x, q3, color="darkorange", linewidth=1.2, linestyle="--", zorder=3)
+        ax.plot(x, med, color="darkorange", linewidth=2, zorder=4, label="Médiane")
+    if highlight is not None:
+        ax.plot(x, highlight, color="crimson", linewidth=2.2, marker="o", markersize=4, zorder=5, label="Sélection")
+
+    for xi in x:
+        ax.axvline(xi, color="black", linewidth=0.6, alpha=0.5, zorder=1)
+    ax.set_xlim(-0.3, len(VARIABLES) - 0.7)
+    ax.set_ylim(0, 100)
+    ax.set_xticks(x)
+    ax.set_xticklabels(VARIABLES, rotation=45, ha="right", fontsize=8)
+    ax.set_ylabel("Score (0–100)", fontsize=9)
+    ax.grid(False)
+    if n or highlight is not None:
+        ax.legend(loc="upper right", fontsize=8)
+    return mode
+
+
+def draw_radar(ax, matrix: np.ndarray, names: Sequence[str] = (),
+               highlight: Optional[np.ndarray] = None) -> str:
+    """
+    Radar des 16 variables sur un Axes polaire. Jusqu'à RADAR_LIMIT personnes : un polygone
+    par personne ; au-delà : médiane et bande interquartile. Retourne le mode de rendu.
+    """
+    m = np.asarray(matrix)
+    n = len(m)
+    ax.clear()
+    angles = np.linspace(0, 2 * np.pi, len(VARIABLES), endpoint=False)
+    closed = np.append(angles, angles[0])
+
+    def ring(v) -> np.ndarray:
+        v = np.asarray(v, dtype=np.float64)
+        return np.append(v, v[0])
+
+    mode = "individuel"
+    if n <= RADAR_LIMIT:
+        for i, row in enumerate(m):
+            label = names[i] if i < len(names) else None
+            ax.plot(closed, ring(row), linewidth=1.6, label=label)
+            ax.fill(closed, ring(row), alpha=0.08)
+    else:
+        mode = "agrégé"
+        q1, med, q3 = column_quantiles(m)
+        ax.fill_between(closed, ring(q1), ring(q3), color="darkorange", alpha=0.25, label="Q1–Q3")
+        ax.plot(closed, ring(med), color="darkorange", linewidth=2, label="Médiane")
+    if highlight is not None:
+        ax.plot(closed, ring(highlight), color="crimson", linewidth=2.2, label="Sélection")
+
+    ax.set_theta_offset(np.pi / 2)
+    ax.set_theta_direction(-1)
+    ax.set_rlabel_position(180 / len(VARIABLES))
+    ax.set_xticks(angles)
+    ax.set_xticklabels(VARIABLES, fontsize=7)
+    ax.set_ylim(0, 100)
+    ax.set_yticks([25, 50, 75, 100])
+    ax.tick_params(axis="y", labelsize=7)
+    if ax.get_legend_handles_labels()[0]:
+        ax.legend(loc="upper right", bbox_to_anchor=(1.3, 1.1), fontsize=8)
+    return mode
@@ -0,0 +1,150 @@
+# precision.py
+"""
+Contrôle de non-régression numérique du modèle de coordonnées.
+
+Corpus de référence (déterministe) :
+  - grille complète 0..100 de chaque variable, les 15 autres fixées à 0, puis à 50 ;
+  - profils aléatoires (scores uniformes 0..100, et profils « valides » où pôle A + pôle B <= 100).
+
+Les sorties de référence sont celles de l'implémentation scalaire (math, float64),
+apply_transformations_and_get_coordinates, figées dans GOLDEN_PATH avec MODEL_VERSION.
+Pour chaque précision de coordinates_batch, on mesure l'écart maximal et quadratique moyen,
+et on vérifie qu'aucun quadrant ne change.
+
+Utilisation :
+  python precision.py                  # rapport + code de sortie non nul en cas d'écart
+  python precision.py --write-golden   # régénère le corpus (après un changement de MODEL_VERSION)
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import Dict, Tuple
+
+import numpy as np
+
+from model import (
+    MODEL_VERSION,
+    PAIRS,
+    PRECISIONS,
+    VARIABLES,
+    apply_transformations_and_get_coordinates,
+    coordinates_batch,
+    vector_to_scores,
+)
+
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_coordinates.npz")
+
+# Écart maximal toléré (valeur absolue) par rapport à l'implémentation scalaire
+TOLERANCES = {"float64": 1e-12, "float32": 1e-5}
+
+N_RANDOM = 4096
+
+
+def golden_corpus(n_random: int = N_RANDOM, seed: int = 0) -> np.ndarray:
+    """Profils (N, 16) uint8 du corpus de référence."""
+    n_vars = len(VARIABLES)
+    grid = []
+    for baseline in (0, 50):
+        block = np.full((n_vars, 101, n_vars), baseline, dtype=np.uint8)
+        for j in range(n_vars):
+            block[j, :, j] = np.arange(101)
+        grid.append(block.reshape(-1, n_vars))
+
+    rng = np.random.default_rng(seed)
+    uniform = rng.integers(0, 101, (n_random, n_vars), dtype=np.uint8)
+    valid = np.empty((n_random, n_vars), dtype=np.uint8)
+    for a, b in PAIRS:
+        valid[:, a] = rng.integers(0, 101, n_random)
+        valid[:, b] = (rng.random(n_random) * (101 - valid[:, a].astype(np.int64))).astype(np.uint8)
+    return np.concatenate(grid + [uniform, valid])
+
+
+def reference_coordinates(matrix: np.ndarray) -> np.ndarray:
+    """Sorties de l'implémentation scalaire (math, float64), ligne par ligne."""
+    return np.array(
+        [apply_transformations_and_get_coordinates(vector_to_scores(row)) for row in matrix],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+
+
+def write_golden(path: str = GOLDEN_PATH):
+    scores = golden_corpus()
+    np.savez_compressed(path, scores=scores, coords=reference_coordinates(scores),
+                        model_version=np.array(MODEL_VERSION))
+
+
+def load_golden(path: str = GOLDEN_PATH) -> Tuple[np.ndarray, np.ndarray]:
+    with np.load(path) as data:
+        version = str(data["model_version"])
+        if version != MODEL_VERSION:
+            raise ValueError(f"Corpus de référence du modèle v{version}, modèle actuel v{MODEL_VERSION} : "
+                             "relancer python precision.py --write-golden")
+        return data["scores"], data["coords"]
+
+
+def _quadrant(xy: np.ndarray) -> np.ndarray:
+    # Même convention que spatial.RegionIndex.quadrant_counts : les axes comptent à droite / en haut
+    return (xy[:, 0] >= 0).astype(np.int8) * 2 + (xy[:, 1] >= 0)
+
+
+def compare_scalar(scores: np.ndarray, golden: np.ndarray) -> Dict[str, float]:
+    # L'implémentation de référence elle-même ne doit pas dériver (comparaison exacte)
+    return {"max_abs": float(np.abs(reference_coordinates(scores) - golden).max())}
+
+
+def compare(scores: np.ndarray, golden: np.ndarray, precision: str) -> Dict[str, float]:
+    out = coordinates_batch(scores, precision=precision).astype(np.float64)
+    err = np.abs(out - golden)
+    return {
+        "max_abs_x": float(err[:, 0].max()),
+        "max_abs_y": float(err[:, 1].max()),
+        "rms": float(np.sqrt((err ** 2).mean())),
+        "max_rel": float((err / np.maximum(np.abs(golden), 1e-3)).max()),
+        "quadrant_changes": int((_quadrant(out) != _quadrant(golden)).sum()),
+    }
+
+
+def check(path: str = GOLDEN_PATH) -> Tuple[bool, Dict[str, Dict[str, float]]]:
+    """
+    Vérifie l'implémentation scalaire contre le corpus figé, puis chaque précision.
+    Retourne (succès, rapport par précision).
+    """
+    scores, golden = load_golden(path)
+    report = {"scalaire": compare_scalar(scores, golden)}
+    for name in PRECISIONS:
+        report[name] = compare(scores, golden, name)
+
+    ok = report["scalaire"]["max_abs"] == 0.0
+    for name in PRECISIONS:
+        r = report[name]
+        ok &= max(r["max_abs_x"], r["max_abs_y"]) <= TOLERANCES[name] and r["quadrant_changes"] == 0
+    return ok, report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Contrôle de précision du modèle de coordonnées")
+    parser.add_argument("--write-golden", action="store_true", help="régénère le corpus de référence")
+    parser.add_argument("--golden", default=GOLDEN_PATH)
+    args = parser.parse_args(argv)
+
+    if args.write_golden:
+        write_golden(args.golden)
+        print(f"Corpus écrit : {args.golden}")
+        return 0
+
+    ok, report = check(args.golden)
+    print(f"Implémentation scalaire : écart max {report['scalaire']['max_abs']:.3g}")
+    for name in PRECISIONS:
+        r = report[name]
+        print(f"{name:8s} : max |dx| {r['max_abs_x']:.3g}  max |dy| {r['max_abs_y']:.3g}  "
+              f"rms {r['rms']:.3g}  rel. max {r['max_rel']:.3g}  "
+              f"quadrants modifiés {r['quadrant_changes']}  (tolérance {TOLERANCES[name]:g})")
+    print("OK" if ok else "ÉCHEC")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
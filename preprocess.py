@@ -0,0 +1,334 @@
+# preprocess.py
+"""
+Prétraitement des captures Politiscales avant l'OCR (photos d'écran, JPEG compressés,
+captures en mode sombre ou redimensionnées).
+
+Étapes (NumPy / Pillow, sans boucle Python par pixel) :
+  1) décodage paresseux : l'image n'est décodée qu'ici, à résolution réduite pour les JPEG
+     (Image.draft), et l'orientation EXIF des photos est appliquée ;
+  2) mise à l'échelle à une largeur canonique ;
+  3) normalisation du contraste (inversion du mode sombre, étirement par percentiles) ;
+  4) redressement (angle estimé par profil de projection des pixels d'encre) ;
+  5) recalage optionnel sur une capture de référence (corrélation de phase, translation).
+
+extract_scores() enchaîne prétraitement et OCR ; elle est exécutée dans les processus du pool
+d'ingest.extract_images, une image à la fois par processus, ce qui borne la mémoire.
+Le prétraitement est optionnel (désactivé par défaut) et ne sert que de repli : la capture brute,
+lue correctement dans le cas des captures d'écran nettes, est essayée en premier.
+
+Vérification sur des captures nettes (scores identiques avec et sans prétraitement) :
+  python preprocess.py --check dossier_ou_images…
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageFilter, ImageOps
+
+from model import PAIRS, VARIABLES
+
+
+CANONICAL_WIDTH = 1200
+
+
+@dataclass(frozen=True)
+class PreprocessConfig:
+    width: int = CANONICAL_WIDTH
+    contrast: bool = True
+    clip_percent: float = 1.0      # pourcentage écrêté de chaque côté de l'histogramme
+    denoise: bool = True           # filtre médian 3 × 3 (artefacts JPEG)
+    deskew: bool = True
+    max_skew: float = 8.0          # degrés
+    template: Optional[str] = None # capture de référence pour le recalage
+    raw_first: bool = True         # OCR de la capture brute d'abord, image prétraitée en repli
+
+
+# ============================================================
+#  DÉCODAGE ET MISE À L'ÉCHELLE
+# ============================================================
+
+def load_gray(path: str, width: int = CANONICAL_WIDTH) -> Image.Image:
+    """Ouvre une capture en niveaux de gris, décodée directement à une résolution proche de `width`."""
+    img = Image.open(path)
+    if img.width > 2 * width:
+        # JPEG : réduction 1/2, 1/4 ou 1/8 dès le décodage (sans effet sur les autres formats)
+        img.draft("L", (width, max(1, img.height * width // img.width)))
+    img = ImageOps.exif_transpose(img)
+    if img.mode in ("RGBA", "LA", "P"):
+        # Transparence : fond blanc, comme à l'écran
+        rgba = img.convert("RGBA")
+        bg = Image.new("RGBA", rgba.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(bg, rgba)
+    return img.convert("L")
+
+
+def rescale(img: Image.Image, width: int = CANONICAL_WIDTH) -> Image.Image:
+    if img.width == width:
+        return img
+    height = max(1, round(img.height * width / img.width))
+    return img.resize((width, height), Image.LANCZOS if img.width > width else Image.BICUBIC)
+
+
+# ============================================================
+#  CONTRASTE
+# ============================================================
+
+def normalize_contrast(gray: np.ndarray, clip_percent: float = 1.0) -> np.ndarray:
+    """
+    Fond clair / texte sombre quel que soit le thème, puis étirement de l'histogramme
+    entre les percentiles clip_percent et 100 - clip_percent (table de correspondance 256 entrées).
+    """
+    hist = np.bincount(gray.ravel(), minlength=256)
+    cum = np.cumsum(hist)
+    total = cum[-1]
+    if np.searchsorted(cum, total / 2) < 128:
+        # Mode sombre : majorité de pixels foncés
+        gray = 255 - gray
+        hist = hist[::-1]
+        cum = np.cumsum(hist)
+
+    lo = int(np.searchsorted(cum, total * clip_percent / 100.0))
+    hi = int(np.searchsorted(cum, total * (1.0 - clip_percent / 100.0)))
+    if hi <= lo:
+        return gray
+    lut = np.clip((np.arange(256) - lo) * (255.0 / (hi - lo)), 0, 255).astype(np.uint8)
+    return lut[gray]
+
+
+def otsu_threshold(gray: np.ndarray) -> int:
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    w0 = np.cumsum(hist)
+    w1 = w0[-1] - w0
+    m0 = np.cumsum(hist * levels)
+    mu0 = m0 / np.maximum(w0, 1)
+    mu1 = (m0[-1] - m0) / np.maximum(w1, 1)
+    return int(np.argmax(w0 * w1 * (mu0 - mu1) ** 2))
+
+
+# ============================================================
+#  REDRESSEMENT
+# ============================================================
+
+_SKEW_SAMPLE = 200_000
+
+
+def estimate_skew(gray: np.ndarray, max_angle: float = 8.0) -> float:
+    """
+    Angle (degrés, sens trigonométrique) des lignes de texte : celui qui maximise la somme des
+    carrés du profil horizontal des pixels d'encre après cisaillement. Recherche grossière
+    (pas de 0,5°) puis fine (0,1°).
+    """
+    ys, xs = np.nonzero(gray < otsu_threshold(gray))
+    if len(ys) < 100:
+        return 0.0
+    if len(ys) > _SKEW_SAMPLE:
+        pick = np.random.default_rng(0).choice(len(ys), _SKEW_SAMPLE, replace=False)
+        ys, xs = ys[pick], xs[pick]
+    xs = xs - xs.mean()
+    ys = ys.astype(np.float64)
+    pad = int(abs(xs).max() * np.tan(np.radians(max_angle))) + 1
+
+    def score(angle: float) -> float:
+        rows = np.rint(ys + xs * np.tan(np.radians(angle))).astype(np.intp) + pad
+        h = np.bincount(rows).astype(np.float64)
+        return float(h @ h)
+
+    coarse = np.arange(-max_angle, max_angle + 1e-9, 0.5)
+    best = coarse[int(np.argmax([score(a) for a in coarse]))]
+    fine = np.arange(best - 0.5, best + 0.5 + 1e-9, 0.1)
+    return float(fine[int(np.argmax([score(a) for a in fine]))])
+
+
+def deskew(img: Image.Image, angle: float) -> Image.Image:
+    if abs(angle) < 0.05:
+        return img
+    return img.rotate(-angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+
+
+# ============================================================
+#  RECALAGE SUR UNE CAPTURE DE RÉFÉRENCE
+# ============================================================
+
+@lru_cache(maxsize=4)
+def _load_template(path: str, width: int) -> np.ndarray:
+    """Référence prétraitée une seule fois par processus."""
+    img = rescale(load_gray(path, width), width)
+    return normalize_contrast(np.asarray(img))
+
+
+def phase_shift(image: np.ndarray, template: np.ndarray) -> Tuple[int, int, float]:
+    """
+    Translation (dy, dx) à appliquer à `image` pour la superposer à `template` (corrélation de
+    phase sur l'encre), avec la hauteur du pic normalisé (confiance).
+    """
+    shape = template.shape
+    a = np.zeros(shape)
+    h, w = min(shape[0], image.shape[0]), min(shape[1], image.shape[1])
+    a[:h, :w] = 255.0 - image[:h, :w]
+    b = 255.0 - template.astype(np.float64)
+
+    fa, fb = np.fft.rfft2(a), np.fft.rfft2(b)
+    cross = fb * np.conj(fa)
+    cross /= np.maximum(np.abs(cross), 1e-9)
+    corr = np.fft.irfft2(cross, s=shape)
+    peak = int(np.argmax(corr))
+    dy, dx = np.unravel_index(peak, shape)
+    # Décalages au-delà de la moitié : négatifs (périodicité de la FFT)
+    dy = dy - shape[0] if dy > shape[0] // 2 else dy
+    dx = dx - shape[1] if dx > shape[1] // 2 else dx
+    return int(dy), int(dx), float(corr.flat[peak])
+
+
+def register(gray: np.ndarray, template: np.ndarray, min_confidence: float = 0.05) -> np.ndarray:
+    """Replace la capture dans le cadre de la référence (même taille, fond blanc)."""
+    dy, dx, conf = phase_shift(gray, template)
+    if conf < min_confidence:
+        return gray
+    out = np.full(template.shape, 255, dtype=np.uint8)
+    h, w = gray.shape
+    y0, x0 = max(0, dy), max(0, dx)
+    y1, x1 = min(template.shape[0], dy + h), min(template.shape[1], dx + w)
+    if y1 > y0 and x1 > x0:
+        out[y0:y1, x0:x1] = gray[y0 - dy:y1 - dy, x0 - dx:x1 - dx]
+    return out
+
+
+# ============================================================
+#  PIPELINE
+# ============================================================
+
+def preprocess_image(path: str, config: PreprocessConfig = PreprocessConfig()) -> np.ndarray:
+    """Capture -> image uint8 (niveaux de gris, fond blanc) prête pour l'OCR."""
+    img = rescale(load_gray(path, config.width), config.width)
+    if config.denoise:
+        img = img.filter(ImageFilter.MedianFilter(3))
+    gray = np.asarray(img)
+    if config.contrast:
+        gray = normalize_contrast(gray, config.clip_percent)
+    if config.deskew:
+        angle = estimate_skew(gray, config.max_skew)
+        if abs(angle) >= 0.05:
+            gray = np.asarray(rescale(deskew(Image.fromarray(gray), angle), config.width))
+    if config.template:
+        gray = register(gray, _load_template(config.template, config.width))
+    return gray
+
+
+def _plausible(scores: Dict[str, int]) -> bool:
+    """16 variables entières 0..100 et pôle A + pôle B <= 100 pour chaque paire."""
+    try:
+        v = [int(scores[k]) for k in VARIABLES]
+    except (KeyError, TypeError, ValueError):
+        return False
+    return all(0 <= x <= 100 for x in v) and all(v[a] + v[b] <= 100 for a, b in PAIRS)
+
+
+def _ocr_preprocessed(path: str, config: PreprocessConfig) -> Dict[str, int]:
+    from ocr import extract_scores_from_image
+
+    fd, tmp = tempfile.mkstemp(suffix=".png")
+    os.close(fd)
+    try:
+        Image.fromarray(preprocess_image(path, config)).save(tmp, compress_level=1)
+        return extract_scores_from_image(tmp)
+    finally:
+        os.unlink(tmp)
+
+
+def extract_scores(path: str, config: Optional[PreprocessConfig] = None) -> Dict[str, int]:
+    """
+    OCR d'une capture. config=None (défaut) : capture brute uniquement.
+
+    Avec une config, la capture brute est lue d'abord (raw_first) ; l'image prétraitée n'est
+    essayée que si l'OCR échoue ou donne des scores incohérents (hors 0..100, paire > 100).
+    raw_first=False inverse l'ordre. Si aucune lecture n'est cohérente, la première obtenue
+    est retournée (la validation la signalera) ; si toutes échouent, la première erreur remonte.
+    """
+    from ocr import extract_scores_from_image
+
+    if config is None:
+        return extract_scores_from_image(path)
+
+    attempts = [lambda: extract_scores_from_image(path), lambda: _ocr_preprocessed(path, config)]
+    if not config.raw_first:
+        attempts.reverse()
+
+    first_error: Optional[Exception] = None
+    first_scores: Optional[Dict[str, int]] = None
+    for attempt in attempts:
+        try:
+            scores = attempt()
+        except Exception as e:
+            first_error = first_error or e
+            continue
+        if _plausible(scores):
+            return scores
+        first_scores = first_scores or scores
+    if first_scores is not None:
+        return first_scores
+    raise first_error
+
+
+# ============================================================
+#  VÉRIFICATION SUR DES CAPTURES NETTES
+# ============================================================
+
+def compare_clean_captures(paths: Sequence[str], config: PreprocessConfig = PreprocessConfig()
+                           ) -> List[Tuple[str, str]]:
+    """
+    Lit chaque capture brute puis prétraitée (sans repli) ; retourne les (chemin, écart) des
+    captures dont les scores diffèrent ou dont une seule lecture réussit.
+    """
+    from ocr import extract_scores_from_image
+
+    mismatches: List[Tuple[str, str]] = []
+    for path in paths:
+        results = []
+        for read in (lambda: extract_scores_from_image(path), lambda: _ocr_preprocessed(path, config)):
+            try:
+                results.append(read())
+            except Exception as e:
+                results.append(e)
+        raw, pre = results
+        raw_failed, pre_failed = isinstance(raw, Exception), isinstance(pre, Exception)
+        if raw_failed and pre_failed:
+            continue  # illisible dans les deux cas : même comportement
+        if raw_failed or pre_failed:
+            which, err = ("brute", raw) if raw_failed else ("prétraitée", pre)
+            mismatches.append((path, f"échec de la lecture {which} : {err}"))
+            continue
+        diff = [f"{k} {raw.get(k)} -> {pre.get(k)}" for k in VARIABLES if raw.get(k) != pre.get(k)]
+        if diff:
+            mismatches.append((path, ", ".join(diff)))
+    return mismatches
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Prétraitement des captures Politiscales")
+    parser.add_argument("--check", nargs="+", metavar="CAPTURE",
+                        help="captures nettes (ou dossiers) : scores identiques avec et sans prétraitement")
+    args = parser.parse_args(argv)
+    if not args.check:
+        parser.print_help()
+        return 2
+
+    from ingest import list_images
+
+    paths = [p for a in args.check for p in (list_images(a) if os.path.isdir(a) else [a])]
+    mismatches = compare_clean_captures(paths)
+    for path, msg in mismatches:
+        print(f"{path} : {msg}")
+    print(f"{len(paths) - len(mismatches)}/{len(paths)} captures identiques")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
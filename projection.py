@@ -0,0 +1,179 @@
+# projection.py
+"""
+Plans alternatifs calculés à partir des données : projections linéaires des 16 variables
+normalisées (scores / 100) vers un plan 2D.
+
+- IncrementalPCA    : analyse en composantes principales ajustée en flux (moyenne et matrice
+                      de covariance 16 × 16 cumulées bloc par bloc, fusion de Chan et al.).
+- RandomProjection  : deux directions orthonormées tirées au hasard (graine fixe) ; seule
+                      l'échelle est ajustée sur les données.
+
+Les coordonnées sont mises à l'échelle pour que ±3 écarts-types de l'axe le plus dispersé
+couvrent le plan [-PLANE_LIMIT, PLANE_LIMIT], avec la même échelle sur les deux axes.
+"""
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from model import PLANE_LIMIT, VARIABLES
+from personalities_data import PersonalityPoint
+
+# Taille des blocs pour l'ajustement et la projection en flux
+CHUNK_ROWS = 65536
+
+_DIM = len(VARIABLES)
+
+
+def iter_row_chunks(matrix: np.ndarray, rows: int = CHUNK_ROWS) -> Iterator[np.ndarray]:
+    for start in range(0, len(matrix), rows):
+        yield matrix[start:start + rows]
+
+
+class LinearProjection:
+    """Base commune : coordonnées = ((v - moyenne) @ composantes.T) * échelle."""
+
+    key = ""
+    label = ""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = np.zeros(_DIM)
+        self._m2 = np.zeros((_DIM, _DIM))
+        self.components: Optional[np.ndarray] = None  # (2, 16)
+        self.scale = 1.0
+        self._stale = True
+
+    @property
+    def fitted(self) -> bool:
+        return self.n > 1
+
+    def partial_fit(self, matrix: np.ndarray) -> "LinearProjection":
+        """Cumule un bloc (N, 16) de scores 0..100."""
+        v = np.asarray(matrix, dtype=np.float64) / 100.0
+        nb = len(v)
+        if nb == 0:
+            return self
+        mean_b = v.mean(axis=0)
+        d = v - mean_b
+        m2_b = d.T @ d
+
+        n = self.n + nb
+        delta = mean_b - self.mean
+        self._m2 += m2_b + np.outer(delta, delta) * (self.n * nb / n)
+        self.mean += delta * (nb / n)
+        self.n = n
+        self._stale = True
+        return self
+
+    def fit(self, chunks: Iterable[np.ndarray]) -> "LinearProjection":
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+
+    @property
+    def covariance(self) -> np.ndarray:
+        return self._m2 / max(1, self.n - 1)
+
+    def _directions(self, cov: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _finalize(self):
+        if not self._stale:
+            return
+        if not self.fitted:
+            raise ValueError("Projection non ajustée : au moins deux profils sont nécessaires.")
+        cov = self.covariance
+        w = self._directions(cov)
+        # Signe déterministe : la plus forte contribution de chaque axe est positive
+        signs = np.sign(w[np.arange(2), np.argmax(np.abs(w), axis=1)])
+        w = w * np.where(signs == 0, 1.0, signs)[:, None]
+        self.components = w
+        spread = np.sqrt(max(float(np.max(np.einsum("ij,jk,ik->i", w, cov, w))), 0.0))
+        self.scale = PLANE_LIMIT / (3.0 * spread) if spread > 0 else 1.0
+        self._stale = False
+
+    def transform(self, matrix: np.ndarray, clamp: bool = True) -> np.ndarray:
+        """Scores (N, 16) -> coordonnées (N, 2) dans le plan ajusté."""
+        self._finalize()
+        m = np.asarray(matrix)
+        out = np.empty((len(m), 2), dtype=np.float64)
+        proj = self.components.T * self.scale
+        offset = self.mean @ proj
+        for start in range(0, len(m), CHUNK_ROWS):
+            block = m[start:start + CHUNK_ROWS].astype(np.float64) / 100.0
+            np.subtract(block @ proj, offset, out=out[start:start + CHUNK_ROWS])
+        if clamp:
+            np.clip(out, -PLANE_LIMIT, PLANE_LIMIT, out=out)
+        return out
+
+    def noise_covariance(self, sigma: float) -> np.ndarray:
+        """Covariance 2 × 2 des coordonnées pour un bruit de ±sigma points indépendant sur chaque score."""
+        self._finalize()
+        w = self.components * self.scale
+        return (sigma / 100.0) ** 2 * (w @ w.T)
+
+    def axis_labels(self) -> Tuple[str, str]:
+        """Légendes d'axes : variables de plus forte contribution positive / négative."""
+        self._finalize()
+        labels = []
+        for i, w in enumerate(self.components):
+            hi, lo = int(np.argmax(w)), int(np.argmin(w))
+            labels.append(f"Axe {i + 1} : {VARIABLES[lo]} (−)  |  {VARIABLES[hi]} (+)")
+        return labels[0], labels[1]
+
+
+class IncrementalPCA(LinearProjection):
+    key = "acp"
+    label = "ACP (données)"
+
+    def _directions(self, cov: np.ndarray) -> np.ndarray:
+        values, vectors = np.linalg.eigh(cov)
+        return vectors[:, np.argsort(values)[::-1][:2]].T
+
+
+class RandomProjection(LinearProjection):
+    key = "aleatoire"
+    label = "Projection aléatoire"
+
+    def __init__(self, seed: int = 0):
+        super().__init__()
+        q, _ = np.linalg.qr(np.random.default_rng(seed).standard_normal((_DIM, 2)))
+        self._w = q.T
+
+    def _directions(self, cov: np.ndarray) -> np.ndarray:
+        return self._w
+
+
+# Plans proposés dans l'interface ("classique" = modèle de coordonnées fixe)
+CLASSIC_KEY = "classique"
+CLASSIC_LABEL = "Classique (économie / société)"
+PROJECTIONS = {cls.key: cls for cls in (IncrementalPCA, RandomProjection)}
+PLANE_LABELS: Dict[str, str] = {CLASSIC_KEY: CLASSIC_LABEL, **{k: c.label for k, c in PROJECTIONS.items()}}
+
+
+def fit_projection(key: str, matrix: np.ndarray, chunk_rows: int = CHUNK_ROWS) -> LinearProjection:
+    """Ajuste en flux la projection `key` sur une matrice (N, 16)."""
+    try:
+        cls = PROJECTIONS[key]
+    except KeyError:
+        raise ValueError(f"Projection inconnue : {key}") from None
+    return cls().fit(iter_row_chunks(matrix, chunk_rows))
+
+
+def project_personalities(personalities: Sequence[PersonalityPoint],
+                          projection: LinearProjection) -> List[PersonalityPoint]:
+    """
+    Personnalités disposant d'un profil de scores, replacées dans le plan ajusté (les autres,
+    sans position connue dans ce plan, sont omises).
+
+    Les demi-axes ux / uy sont des estimations faites dans le plan classique : ils ne se
+    transposent pas et sont mis à zéro (pas d'ellipse d'incertitude dans un plan ajusté).
+    """
+    with_scores = [p for p in personalities if p.scores is not None]
+    if not with_scores:
+        return []
+    xy = projection.transform(np.array([p.scores for p in with_scores], dtype=np.uint8))
+    return [replace(p, x=float(x), y=float(y), ux=0.0, uy=0.0) for p, (x, y) in zip(with_scores, xy)]
@@ -0,0 +1,200 @@
+# render.py
+"""
+Rendu headless (backend Agg) du plan politique, identique à celui de PlotFrame.
+
+- Le fond statique (quadrants, axes, ellipses de personnalités) est pré-rendu une fois
+  par (filtre, taille, dpi) ; seules les personnes sont dessinées par-dessus (blitting).
+- Les PNG produits sont mis en cache selon leur contenu (personnes, filtre, taille, dpi).
+- render_many() répartit de nombreux rapports individuels sur plusieurs processus.
+
+Exemple :
+    renderer = PlotRenderer()
+    png = renderer.render_png(people, selection="Président", dpi=300)
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import matplotlib.style
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+from personalities_data import PersonalityPoint, get_personalities
+from plot_engine import FIGSIZE, STYLE, draw_base, draw_people, draw_personalities_overlay
+
+
+_BackgroundKey = Tuple[str, Tuple[float, float], int]
+
+
+class _Background:
+    """Figure Agg dont le fond statique est déjà rendu et sauvegardé."""
+
+    def __init__(self, personalities: Sequence[PersonalityPoint], selection: str,
+                 figsize: Tuple[float, float], dpi: int):
+        with matplotlib.style.context(STYLE):
+            self.fig = Figure(figsize=figsize, dpi=dpi)
+            self.canvas = FigureCanvasAgg(self.fig)
+            self.ax = self.fig.add_subplot()
+            draw_base(self.ax)
+            draw_personalities_overlay(self.ax, personalities, selection)
+            self.fig.tight_layout()
+            self.canvas.draw()
+        self.region = self.canvas.copy_from_bbox(self.fig.bbox)
+
+    def render(self, people: Sequence[dict], rng: random.Random) -> Image.Image:
+        self.canvas.restore_region(self.region)
+        with matplotlib.style.context(STYLE):
+            artists = draw_people(self.ax, people, rng)
+            renderer = self.canvas.get_renderer()
+            for artist in artists:
+                artist.draw(renderer)
+        for artist in artists:
+            artist.remove()
+        return Image.fromarray(np.asarray(self.canvas.buffer_rgba())).convert("RGB")
+
+
+class PlotRenderer:
+    """Moteur de rendu headless avec fonds pré-rendus et cache d'images par contenu."""
+
+    def __init__(self, personalities: Optional[List[PersonalityPoint]] = None,
+                 max_backgrounds: int = 16, max_cache_bytes: int = 64 * 1024 * 1024):
+        self.personalities = personalities if personalities is not None else get_personalities()
+        self.max_backgrounds = max_backgrounds
+        self.max_cache_bytes = max_cache_bytes
+
+        self._backgrounds: "OrderedDict[_BackgroundKey, _Background]" = OrderedDict()
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- fonds statiques ----------
+
+    def _background(self, selection: str, figsize: Tuple[float, float], dpi: int) -> _Background:
+        key = ((selection or "Aucun").strip(), (float(figsize[0]), float(figsize[1])), int(dpi))
+        bg = self._backgrounds.get(key)
+        if bg is None:
+            bg = _Background(self.personalities, key[0], key[1], key[2])
+            self._backgrounds[key] = bg
+            if len(self._backgrounds) > self.max_backgrounds:
+                self._backgrounds.popitem(last=False)
+        else:
+            self._backgrounds.move_to_end(key)
+        return bg
+
+    # ---------- cache par contenu ----------
+
+    @staticmethod
+    def content_key(people: Sequence[dict], selection: str, figsize: Tuple[float, float], dpi: int) -> str:
+        payload = json.dumps(
+            [
+                (selection or "Aucun").strip(),
+                [float(figsize[0]), float(figsize[1])],
+                int(dpi),
+                [(p["name"], round(float(p["x"]), 6), round(float(p["y"]), 6)) for p in people],
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_put(self, key: str, png: bytes):
+        if len(png) > self.max_cache_bytes:
+            return
+        self._cache[key] = png
+        self._cache_bytes += len(png)
+        while self._cache_bytes > self.max_cache_bytes:
+            _, old = self._cache.popitem(last=False)
+            self._cache_bytes -= len(old)
+
+    # ---------- API ----------
+
+    def render_png(self, people: Sequence[dict], selection: str = "Aucun",
+                   figsize: Tuple[float, float] = FIGSIZE, dpi: int = 300) -> bytes:
+        key = self.content_key(people, selection, figsize, dpi)
+        png = self._cache.get(key)
+        if png is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return png
+
+        self.misses += 1
+        # Couleurs aléatoires comme dans PlotFrame, mais reproductibles pour un même contenu.
+        rng = random.Random(key)
+        image = self._background(selection, figsize, dpi).render(people, rng)
+
+        buf = io.BytesIO()
+        image.save(buf, format="PNG", dpi=(dpi, dpi))
+        png = buf.getvalue()
+        self._cache_put(key, png)
+        return png
+
+    def render_to_file(self, path: str, people: Sequence[dict], selection: str = "Aucun",
+                       figsize: Tuple[float, float] = FIGSIZE, dpi: int = 300) -> str:
+        png = self.render_png(people, selection, figsize, dpi)
+        with open(path, "wb") as fh:
+            fh.write(png)
+        return path
+
+    def cache_info(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": len(self._cache),
+            "bytes": self._cache_bytes,
+            "backgrounds": len(self._backgrounds),
+        }
+
+
+# ============================================================
+#  RENDU PARALLÈLE (rapports individuels)
+# ============================================================
+
+@dataclass
+class RenderJob:
+    path: str
+    people: List[dict]
+    selection: str = "Aucun"
+    figsize: Tuple[float, float] = FIGSIZE
+    dpi: int = 300
+
+
+_worker_renderer: Optional[PlotRenderer] = None
+
+
+def _init_worker():
+    global _worker_renderer
+    _worker_renderer = PlotRenderer()
+
+
+def _run_job(job: RenderJob) -> str:
+    return _worker_renderer.render_to_file(job.path, job.people, job.selection, job.figsize, job.dpi)
+
+
+def render_many(jobs: Iterable[RenderJob], processes: Optional[int] = None, chunksize: int = 8) -> Iterator[str]:
+    """
+    Rend une série d'images dans plusieurs processus (un PlotRenderer par processus,
+    donc fonds pré-rendus réutilisés d'un job à l'autre). Renvoie les chemins écrits, dans l'ordre.
+
+    Grouper les jobs par filtre/taille maximise la réutilisation des fonds.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1:
+        _init_worker()
+        for job in jobs:
+            yield _run_job(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as pool:
+        yield from pool.map(_run_job, jobs, chunksize=chunksize)
@@ -0,0 +1,494 @@
+# server.py
+"""
+Service HTTP local (asyncio) exposant le modèle de coordonnées Politiscales.
+
+Endpoints (JSON) :
+  GET  /health         -> {"status": "ok"}
+  GET  /stats          -> statistiques de micro-batching et de charge
+  POST /score          {"scores": {16 variables}}                  -> {"x", "y"}
+  POST /score/batch    {"profiles": [{16 variables}, ...]}         -> {"coordinates": [[x, y], ...]}
+  POST /nearest        {"scores": {...}} ou {"x", "y"}, "k": 5     -> {"x", "y", "nearest": [...]}
+  POST /extract        {"image_base64": "..."} ou {"path": "..."}  -> {"scores": {...}}
+
+/extract lit l'image envoyée ; 'path' n'est accepté que si le service est lancé avec
+--extract-root, et seulement pour un fichier situé dans ce dossier (403 sinon).
+
+Les petites requêtes concurrentes sont regroupées (micro-batching) en un seul appel
+vectorisé, après déduplication des profils identiques du lot (cache.batch_coordinates) ; l'OCR est exécutée dans un pool de processus.
+
+Lancement : python server.py --port 8765
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cache import CoordinateCache, batch_coordinates
+from model import PRECISIONS, VARIABLES
+from personalities_data import PersonalityPoint, get_personalities, nearest_personalities_batch
+from preprocess import PreprocessConfig, extract_scores
+
+log = logging.getLogger("politiscales.server")
+
+
+# ============================================================
+#  CONFIGURATION
+# ============================================================
+
+@dataclass
+class ServiceConfig:
+    host: str = "127.0.0.1"
+    port: int = 8765
+    max_batch: int = 1024          # lignes max par appel vectorisé
+    max_delay: float = 0.002       # attente max (s) pour remplir un lot
+    max_pending_rows: int = 50_000 # au-delà : 503 (contre-pression)
+    max_batch_rows: int = 10_000   # lignes max dans une requête /score/batch
+    max_body_bytes: int = 8 * 1024 * 1024
+    max_connections: int = 512
+    ocr_workers: int = max(1, (os.cpu_count() or 2) - 1)
+    max_ocr_inflight: int = 32
+    precision: str = "float64"     # précision du calcul vectorisé (model.PRECISIONS)
+    preprocess: bool = False       # /extract : prétraitement des captures en repli (preprocess.py)
+    extract_root: Optional[str] = None  # /extract : seul dossier lisible via 'path' (None : image_base64 seulement)
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Overloaded(HttpError):
+    def __init__(self, message: str = "Service saturé, réessayez plus tard."):
+        super().__init__(HTTPStatus.SERVICE_UNAVAILABLE, message)
+
+
+# ============================================================
+#  MICRO-BATCHING
+# ============================================================
+
+class MicroBatcher:
+    """
+    Regroupe les lignes soumises par des requêtes concurrentes et appelle `fn`
+    une seule fois par lot sur la matrice concaténée (N, 16) -> (N, 2).
+    """
+
+    def __init__(self, fn: Callable[[np.ndarray], np.ndarray], max_batch: int, max_delay: float, max_pending: int):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+
+        self.pending_rows = 0
+        self.batches = 0
+        self.rows = 0
+
+        self._queue: "asyncio.Queue[Tuple[np.ndarray, asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, rows: np.ndarray) -> np.ndarray:
+        n = len(rows)
+        if self.pending_rows + n > self.max_pending:
+            raise Overloaded()
+        self.pending_rows += n
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((rows, fut))
+        return await fut
+
+    def _drain(self, items: List[Tuple[np.ndarray, asyncio.Future]], n: int) -> int:
+        while n < self.max_batch and not self._queue.empty():
+            item = self._queue.get_nowait()
+            items.append(item)
+            n += len(item[0])
+        return n
+
+    async def _run(self):
+        while True:
+            first = await self._queue.get()
+            items = [first]
+            n = self._drain(items, len(first[0]))
+            if n < self.max_batch and self.max_delay > 0:
+                await asyncio.sleep(self.max_delay)
+                n = self._drain(items, n)
+
+            matrix = items[0][0] if len(items) == 1 else np.concatenate([r for r, _ in items])
+            try:
+                result = self.fn(matrix)
+            except Exception as e:
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+            else:
+                offset = 0
+                for rows, fut in items:
+                    if not fut.done():
+                        fut.set_result(result[offset:offset + len(rows)])
+                    offset += len(rows)
+            finally:
+                self.pending_rows -= n
+                self.batches += 1
+                self.rows += n
+
+
+# ============================================================
+#  VALIDATION DES ENTRÉES
+# ============================================================
+
+def _parse_profile(obj) -> np.ndarray:
+    if not isinstance(obj, dict):
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Un profil doit être un objet {variable: score}.")
+    missing = [k for k in VARIABLES if k not in obj]
+    if missing:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"Variables manquantes : {', '.join(missing)}")
+    row = np.empty(len(VARIABLES), dtype=np.uint8)
+    for i, k in enumerate(VARIABLES):
+        v = obj[k]
+        if isinstance(v, bool) or not isinstance(v, int) or not (0 <= v <= 100):
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"'{k}' doit être un entier entre 0 et 100.")
+        row[i] = v
+    return row
+
+
+def _extract_path(path, root: Optional[str]) -> str:
+    """Chemin réel d'un fichier de root (liens symboliques et '..' résolus), sinon HttpError."""
+    if root is None:
+        raise HttpError(HTTPStatus.FORBIDDEN,
+                        "'path' n'est pas accepté par ce service : envoyer 'image_base64' (ou lancer avec --extract-root).")
+    if not isinstance(path, str) or not path or "\0" in path:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "'path' invalide.")
+    root = os.path.realpath(root)
+    real = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, real]) != root:
+        raise HttpError(HTTPStatus.FORBIDDEN, "'path' hors du dossier autorisé.")
+    if not os.path.isfile(real):
+        raise HttpError(HTTPStatus.BAD_REQUEST, "'path' : fichier introuvable.")
+    return real
+
+
+def _extract_worker(path: Optional[str], data: Optional[bytes],
+                    config: Optional[PreprocessConfig] = None) -> Dict[str, int]:
+    """Exécuté dans le pool de processus (OCR et prétraitement éventuel, coûteux en CPU)."""
+    if data is None:
+        return extract_scores(path, config)
+
+    fd, tmp = tempfile.mkstemp(suffix=".png")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        return extract_scores(tmp, config)
+    finally:
+        os.unlink(tmp)
+
+
+# ============================================================
+#  SERVICE
+# ============================================================
+
+class ScoringService:
+    def __init__(self, config: ServiceConfig, personalities: Optional[List[PersonalityPoint]] = None):
+        self.config = config
+        self.personalities = personalities if personalities is not None else get_personalities()
+        self.batcher: Optional[MicroBatcher] = None
+        self.coord_cache = CoordinateCache()
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.connections = 0
+        self.ocr_inflight = 0
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+
+        self._routes = {
+            ("GET", "/health"): self._health,
+            ("GET", "/stats"): self._stats,
+            ("POST", "/score"): self._score,
+            ("POST", "/score/batch"): self._score_batch,
+            ("POST", "/nearest"): self._nearest,
+            ("POST", "/extract"): self._extract,
+        }
+
+    # ---------- cycle de vie ----------
+
+    async def start(self) -> asyncio.AbstractServer:
+        cfg = self.config
+        self.batcher = MicroBatcher(
+            lambda m: batch_coordinates(m, clamp=True, dedup=True, cache=self.coord_cache,
+                                        precision=cfg.precision),
+            max_batch=cfg.max_batch,
+            max_delay=cfg.max_delay,
+            max_pending=cfg.max_pending_rows,
+        )
+        self.batcher.start()
+        self.pool = ProcessPoolExecutor(max_workers=cfg.ocr_workers)
+        return await asyncio.start_server(self._handle, cfg.host, cfg.port)
+
+    async def close(self):
+        if self.batcher is not None:
+            await self.batcher.stop()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+        self.coord_cache.close()
+
+    # ---------- handlers ----------
+
+    async def _health(self, body):
+        return {"status": "ok"}
+
+    async def _stats(self, body):
+        b = self.batcher
+        return {
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "connections": self.connections,
+            "batches": b.batches,
+            "rows": b.rows,
+            "mean_batch_rows": (b.rows / b.batches) if b.batches else 0.0,
+            "pending_rows": b.pending_rows,
+            "ocr_inflight": self.ocr_inflight,
+            "coordinate_cache": self.coord_cache.stats(),
+        }
+
+    async def _score(self, body):
+        row = _parse_profile(body.get("scores"))
+        xy = await self.batcher.submit(row[None, :])
+        return {"x": float(xy[0, 0]), "y": float(xy[0, 1])}
+
+    async def _score_batch(self, body):
+        profiles = body.get("profiles")
+        if not isinstance(profiles, list):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'profiles' doit être une liste.")
+        if len(profiles) > self.config.max_batch_rows:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            f"Au plus {self.config.max_batch_rows} profils par requête.")
+        if not profiles:
+            return {"coordinates": []}
+        matrix = np.stack([_parse_profile(p) for p in profiles])
+        xy = await self.batcher.submit(matrix)
+        return {"coordinates": xy.tolist()}
+
+    async def _nearest(self, body):
+        if "scores" in body:
+            xy = await self.batcher.submit(_parse_profile(body["scores"])[None, :])
+            x, y = float(xy[0, 0]), float(xy[0, 1])
+        else:
+            try:
+                x, y = float(body["x"]), float(body["y"])
+            except (KeyError, TypeError, ValueError):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Fournir 'scores' ou les coordonnées 'x' et 'y'.")
+        k = body.get("k", 5)
+        if isinstance(k, bool) or not isinstance(k, int) or k <= 0:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'k' doit être un entier strictement positif.")
+
+        pts, idx, dist = nearest_personalities_batch(np.array([[x, y]]), k, self.personalities)
+        return {
+            "x": x,
+            "y": y,
+            "nearest": [
+                {"name": pts[i].name, "category": pts[i].category, "x": pts[i].x, "y": pts[i].y, "distance": float(d)}
+                for i, d in zip(idx[0], dist[0])
+            ],
+        }
+
+    async def _extract(self, body):
+        path = data = None
+        if "image_base64" in body:
+            try:
+                data = base64.b64decode(body["image_base64"], validate=True)
+            except (TypeError, ValueError):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "'image_base64' invalide.")
+        elif "path" in body:
+            path = _extract_path(body["path"], self.config.extract_root)
+        else:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Fournir 'image_base64' (ou 'path').")
+
+        if self.ocr_inflight >= self.config.max_ocr_inflight:
+            raise Overloaded("Trop d'extractions OCR en cours, réessayez plus tard.")
+        self.ocr_inflight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            config = PreprocessConfig() if self.config.preprocess else None
+            scores = await loop.run_in_executor(self.pool, _extract_worker, path, data, config)
+        except HttpError:
+            raise
+        except Exception as e:
+            raise HttpError(HTTPStatus.UNPROCESSABLE_ENTITY, f"Erreur OCR : {e}")
+        finally:
+            self.ocr_inflight -= 1
+        return {"scores": {k: int(v) for k, v in scores.items()}}
+
+    # ---------- HTTP ----------
+
+    async def _dispatch(self, method: str, path: str, raw: bytes) -> Tuple[int, dict]:
+        handler = self._routes.get((method, path))
+        if handler is None:
+            known = any(p == path for _, p in self._routes)
+            status = HTTPStatus.METHOD_NOT_ALLOWED if known else HTTPStatus.NOT_FOUND
+            return status, {"error": status.phrase}
+
+        body = {}
+        if raw:
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                return HTTPStatus.BAD_REQUEST, {"error": "Corps JSON invalide."}
+            if not isinstance(body, dict):
+                return HTTPStatus.BAD_REQUEST, {"error": "Le corps doit être un objet JSON."}
+
+        try:
+            return HTTPStatus.OK, await handler(body)
+        except HttpError as e:
+            if e.status == HTTPStatus.SERVICE_UNAVAILABLE:
+                self.rejected += 1
+            return e.status, {"error": e.message}
+        except Exception as e:
+            # Erreur inattendue (handler ou calcul en lot) : la connexion reste utilisable
+            self.errors += 1
+            log.exception("Erreur interne sur %s %s", method, path)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Erreur interne : {e}"}
+
+    @staticmethod
+    def _response(status: int, payload: dict, keep_alive: bool) -> bytes:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {int(status)} {HTTPStatus(status).phrase}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Connection: " + ("keep-alive" if keep_alive else "close"),
+        ]
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            head.append("Retry-After: 1")
+        return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            if self.connections > self.config.max_connections:
+                self.rejected += 1
+                writer.write(self._response(HTTPStatus.SERVICE_UNAVAILABLE,
+                                            {"error": "Trop de connexions simultanées."}, False))
+                await writer.drain()
+                return
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    writer.write(self._response(HTTPStatus.BAD_REQUEST, {"error": "Requête invalide."}, False))
+                    await writer.drain()
+                    return
+
+                headers: Dict[str, str] = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+
+                try:
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    length = -1
+                if length < 0 or length > self.config.max_body_bytes:
+                    status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE if length > 0 else HTTPStatus.BAD_REQUEST
+                    writer.write(self._response(status, {"error": status.phrase}, False))
+                    await writer.drain()
+                    return
+                raw = await reader.readexactly(length) if length else b""
+
+                self.requests += 1
+                status, payload = await self._dispatch(method.upper(), target.split("?", 1)[0], raw)
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+
+# ============================================================
+#  POINT D'ENTRÉE
+# ============================================================
+
+async def serve(config: ServiceConfig):
+    service = ScoringService(config)
+    server = await service.start()
+    print(f"Service Politiscales en écoute sur http://{config.host}:{config.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s : %(message)s")
+    cfg = ServiceConfig()
+    parser = argparse.ArgumentParser(description="Service HTTP local de scoring Politiscales")
+    parser.add_argument("--host", default=cfg.host)
+    parser.add_argument("--port", type=int, default=cfg.port)
+    parser.add_argument("--max-batch", type=int, default=cfg.max_batch, help="lignes max par appel vectorisé")
+    parser.add_argument("--max-delay-ms", type=float, default=cfg.max_delay * 1000, help="attente max pour remplir un lot")
+    parser.add_argument("--max-pending", type=int, default=cfg.max_pending_rows, help="lignes en attente avant 503")
+    parser.add_argument("--ocr-workers", type=int, default=cfg.ocr_workers)
+    parser.add_argument("--precision", choices=sorted(PRECISIONS), default=cfg.precision,
+                        help="float32 : plus rapide, écart < 1e-5 (voir precision.py)")
+    parser.add_argument("--preprocess", action="store_true",
+                        help="/extract : prétraiter les captures si la lecture brute échoue (photos, mode sombre…)")
+    parser.add_argument("--extract-root", default=cfg.extract_root,
+                        help="/extract : dossier dont les fichiers peuvent être lus via 'path' (sinon image_base64 seulement)")
+    args = parser.parse_args()
+
+    cfg.host = args.host
+    cfg.port = args.port
+    cfg.max_batch = args.max_batch
+    cfg.max_delay = args.max_delay_ms / 1000.0
+    cfg.max_pending_rows = args.max_pending
+    cfg.ocr_workers = args.ocr_workers
+    cfg.precision = args.precision
+    cfg.preprocess = args.preprocess
+    cfg.extract_root = args.extract_root
+
+    try:
+        asyncio.run(serve(cfg))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
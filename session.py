@@ -0,0 +1,238 @@
+# session.py
+"""
+Fichiers de session (.pss) : personnes, scores, coordonnées, version du modèle et état de l'interface.
+
+Format binaire compact, par blocs compressés (zlib) :
+
+    b"PSSN" | u16 version | bloc 0 | bloc 1 | ... | en-tête JSON | u64 position de l'en-tête | b"PSSN"
+
+Chaque bloc contient les prénoms (UTF-8 séparés par \\0), les scores (uint8, n × 16) et les
+coordonnées (float64, n × 2). L'en-tête, lu en premier grâce au pied de fichier, décrit les blocs :
+la restauration est paresseuse (un bloc n'est lu qu'à la demande) et incrémentale.
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cache import batch_coordinates
+from model import MODEL_VERSION, VARIABLES, people_to_arrays
+
+
+MAGIC = b"PSSN"
+FORMAT_VERSION = 1
+CHUNK_ROWS = 65536
+
+_PREFIX = struct.Struct("<4sH")
+_FOOTER = struct.Struct("<Q4s")
+
+AUTOSAVE_PATH = os.path.join(os.path.expanduser("~"), ".politiscales", "autosave.pss")
+
+
+# ============================================================
+#  ÉCRITURE
+# ============================================================
+
+def _pack_chunk(names: Sequence[str], scores: np.ndarray, coords: np.ndarray, level: int) -> List[bytes]:
+    return [
+        zlib.compress("\0".join(names).encode("utf-8"), level),
+        zlib.compress(np.ascontiguousarray(scores, dtype=np.uint8).tobytes(), level),
+        zlib.compress(np.ascontiguousarray(coords, dtype="<f8").tobytes(), level),
+    ]
+
+
+def write_session(path: str, names: Sequence[str], scores: np.ndarray, coords: np.ndarray,
+                  state: Optional[Dict[str, Any]] = None, chunk_rows: int = CHUNK_ROWS, level: int = 1):
+    """
+    Écrit une session de façon atomique (fichier temporaire puis remplacement).
+    state : état de l'interface sérialisable en JSON (filtre, étape de l'assistant…).
+    """
+    n = len(names)
+    if scores.shape != (n, len(VARIABLES)) or coords.shape != (n, 2):
+        raise ValueError("names, scores (N, 16) et coords (N, 2) doivent avoir le même nombre de lignes.")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(_PREFIX.pack(MAGIC, FORMAT_VERSION))
+            chunks = []
+            for start in range(0, n, chunk_rows) if n else []:
+                end = min(n, start + chunk_rows)
+                blocks = _pack_chunk(names[start:end], scores[start:end], coords[start:end], level)
+                chunks.append({"offset": fh.tell(), "rows": end - start, "sizes": [len(b) for b in blocks]})
+                for b in blocks:
+                    fh.write(b)
+
+            header = {
+                "model_version": MODEL_VERSION,
+                "variables": list(VARIABLES),
+                "count": n,
+                "saved_at": time.time(),
+                "state": state or {},
+                "chunks": chunks,
+            }
+            header_offset = fh.tell()
+            fh.write(json.dumps(header, ensure_ascii=False).encode("utf-8"))
+            fh.write(_FOOTER.pack(header_offset, MAGIC))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def save_people(path: str, people: Sequence[dict], state: Optional[Dict[str, Any]] = None):
+    names, scores, coords = people_to_arrays(people)
+    write_session(path, names, scores, coords, state)
+
+
+# ============================================================
+#  LECTURE PARESSEUSE
+# ============================================================
+
+class SessionReader:
+    """
+    Ouvre une session en ne lisant que l'en-tête ; les blocs sont décompressés à la demande.
+    Si la session a été produite par une autre version du modèle, les coordonnées sont
+    recalculées à partir des scores.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Un seul descripteur pour toute la durée de vie du lecteur : si le fichier est remplacé
+        # entre-temps (sauvegarde automatique, os.replace), les blocs restent lus dans l'ancien.
+        self._fh = open(path, "rb")
+        try:
+            fh = self._fh
+            magic, version = _PREFIX.unpack(fh.read(_PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError("Ce fichier n'est pas une session Politiscales.")
+            if version > FORMAT_VERSION:
+                raise ValueError(f"Format de session v{version} non pris en charge (max v{FORMAT_VERSION}).")
+            fh.seek(-_FOOTER.size, os.SEEK_END)
+            footer_pos = fh.tell()
+            header_offset, end_magic = _FOOTER.unpack(fh.read(_FOOTER.size))
+            if end_magic != MAGIC:
+                raise ValueError("Session tronquée ou corrompue.")
+            fh.seek(header_offset)
+            self.header: Dict[str, Any] = json.loads(fh.read(footer_pos - header_offset).decode("utf-8"))
+
+            if self.header.get("variables") != list(VARIABLES):
+                raise ValueError("Les variables de cette session ne correspondent pas au modèle actuel.")
+        except BaseException:
+            self._fh.close()
+            raise
+
+    def close(self):
+        self._fh.close()
+
+    def __enter__(self) -> "SessionReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def count(self) -> int:
+        return int(self.header["count"])
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        return self.header.get("state", {})
+
+    @property
+    def stale_coordinates(self) -> bool:
+        return self.header.get("model_version") != MODEL_VERSION
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self.header["chunks"])
+
+    def read_chunk(self, i: int) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        info = self.header["chunks"][i]
+        rows = info["rows"]
+        self._fh.seek(info["offset"])
+        raw = [zlib.decompress(self._fh.read(size)) for size in info["sizes"]]
+        names = raw[0].decode("utf-8").split("\0") if rows else []
+        scores = np.frombuffer(raw[1], dtype=np.uint8).reshape(rows, len(VARIABLES))
+        coords = np.frombuffer(raw[2], dtype="<f8").reshape(rows, 2)
+        if self.stale_coordinates:
+            coords = batch_coordinates(scores, clamp=True)
+        return names, scores, coords
+
+    def iter_chunks(self) -> Iterator[Tuple[List[str], np.ndarray, np.ndarray]]:
+        for i in range(self.n_chunks):
+            yield self.read_chunk(i)
+
+
+# ============================================================
+#  SAUVEGARDE AUTOMATIQUE
+# ============================================================
+
+class Autosaver:
+    """
+    Sauvegarde en arrière-plan sur un thread dédié. schedule() est appelé depuis l'interface
+    avec une fonction produisant un instantané (personnes, état) ; seul le dernier instantané
+    demandé est écrit, après `delay` secondes sans nouvelle demande.
+    """
+
+    def __init__(self, path: str = AUTOSAVE_PATH, delay: float = 2.0,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.path = path
+        self.delay = delay
+        self.on_error = on_error
+        self._cond = threading.Condition()
+        self._snapshot: Optional[Tuple[List[dict], Dict[str, Any]]] = None
+        self._due = 0.0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def schedule(self, people: Sequence[dict], state: Dict[str, Any]):
+        # Copie superficielle : les dicts de personnes ne sont plus modifiés après création
+        with self._cond:
+            self._snapshot = (list(people), dict(state))
+            self._due = time.monotonic() + self.delay
+            self._cond.notify()
+
+    def flush(self):
+        """Écrit immédiatement l'instantané en attente (fermeture de l'application)."""
+        with self._cond:
+            snap, self._snapshot = self._snapshot, None
+        if snap is not None:
+            self._write(snap)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def _write(self, snap: Tuple[List[dict], Dict[str, Any]]):
+        try:
+            save_people(self.path, snap[0], snap[1])
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error(e)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped and (self._snapshot is None or time.monotonic() < self._due):
+                    timeout = None if self._snapshot is None else max(0.0, self._due - time.monotonic())
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+                snap, self._snapshot = self._snapshot, None
+            self._write(snap)
@@ -1,25 +1,61 @@
 # ui.py
 from __future__ import annotations
 
-import random
+import os
+import threading
 import tkinter as tk
-from typing import Dict, List
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
 
 from tkinter import filedialog, messagebox
 from tkinter import ttk
 
-from ocr import extract_scores_from_image
-from model import apply_transformations_and_get_coordinates
-
-from personalities_data import PersonalityPoint, get_personalities
+from cache import batch_coordinates, default_cache
+from export import export_people, iter_people_chunks
+from ingest import IngestResult, extract_images, list_images, parse_form_fields, read_scores
+from model import (
+    VARIABLES,
+    people_from_arrays,
+    scores_to_matrix,
+)
+
+from personalities_data import PersonalityPoint, get_personalities, nearest_personalities
+from plot_engine import (
+    FIGSIZE,
+    PARALLEL_LINE_LIMIT,
+    STYLE,
+    draw_base,
+    draw_parallel,
+    draw_people,
+    draw_personalities_overlay,
+    draw_radar,
+    draw_uncertainty_ellipses,
+    ellipse_half_axes,
+    has_uncertainty,
+    parallel_density,
+    select_personalities,
+)
+from preprocess import PreprocessConfig, extract_scores
+from projection import CLASSIC_KEY, PLANE_LABELS, LinearProjection, fit_projection, project_personalities
+from session import AUTOSAVE_PATH, Autosaver, SessionReader, save_people
+from spatial import EllipseIndex, EllipseRegion, RegionIndex
+from uncertainty import covariance_to_ellipse, propagate
+
+import numpy as np
 
 import matplotlib
 matplotlib.use("TkAgg")
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.patches import Rectangle, Ellipse
 
-plt.style.use("ggplot")
+plt.style.use(STYLE)
+
+# Survol : tolérance de détection et intervalle minimal entre deux traitements
+HOVER_TOLERANCE_PX = 8.0
+HOVER_INTERVAL_MS = 16
+
+# Ellipses d'incertitude gardées en mémoire (une entrée de N ellipses par couple plan / sigma)
+UNCERTAINTY_CACHE_SIZE = 4
 
 
 def _clamp(v: float, lo: float, hi: float) -> float:
@@ -64,16 +100,121 @@ class WizardApp(tk.Tk):
 
         self.frame_start = StartFrame(self.container, self)
         self.frame_form = FormFrame(self.container, self)
+        self.frame_bulk = BulkFrame(self.container, self)
         self.frame_plot = PlotFrame(self.container, self)
+        self.frame_profiles = ProfileFrame(self.container, self)
 
         self.show_frame(self.frame_start)
 
+        # Sauvegarde automatique en arrière-plan + proposition de restauration au démarrage
+        self.autosaver = Autosaver()
+        # Restauration en cours : la sauvegarde automatique est suspendue jusqu'au dernier bloc
+        self._restoring: Optional[SessionReader] = None
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        if os.path.exists(AUTOSAVE_PATH):
+            self.after(200, self._offer_restore)
+
+    def _on_close(self):
+        self._cancel_restore()
+        self.autosaver.stop()
+        default_cache.flush()
+        self.destroy()
+
+    def _offer_restore(self):
+        if messagebox.askyesno("Session", "Une session précédente a été sauvegardée automatiquement.\nLa restaurer ?"):
+            self.open_session(AUTOSAVE_PATH)
+
+    def session_state(self) -> dict:
+        on_plot = self.frame_plot.winfo_ismapped() or self.frame_profiles.winfo_ismapped()
+        step = "plot" if on_plot else "form" if self.frame_form.winfo_ismapped() else "start"
+        return {
+            "step": step,
+            "num_people": self.num_people,
+            "current_index": self.current_index,
+            **self.frame_plot.get_state(),
+        }
+
+    def mark_dirty(self):
+        # Pendant une restauration, people_data est incomplet : ne pas écraser la sauvegarde
+        if self.people_data and self._restoring is None:
+            self.autosaver.schedule(self.people_data, self.session_state())
+
+    def save_session(self, path: str):
+        save_people(path, self.people_data, self.session_state())
+
+    def open_session(self, path: str):
+        """Restauration paresseuse : premier bloc affiché tout de suite, les suivants chargés par after()."""
+        self._cancel_restore()
+        try:
+            reader = SessionReader(path)
+        except Exception as e:
+            messagebox.showerror("Session", f"Impossible d'ouvrir la session :\n{e}")
+            return
+        try:
+            people = people_from_arrays(*reader.read_chunk(0)) if reader.n_chunks else []
+        except Exception as e:
+            reader.close()
+            messagebox.showerror("Session", f"Impossible d'ouvrir la session :\n{e}")
+            return
+
+        self._restoring = reader
+        state = reader.state
+        self.people_data[:] = people
+        self.frame_plot.set_state(state)
+
+        if state.get("step") == "form" and state.get("current_index", 0) < state.get("num_people", 0):
+            self.num_people = int(state["num_people"])
+            self.current_index = int(state["current_index"])
+            self.frame_form.reset_form()
+            self.show_frame(self.frame_form)
+        else:
+            self.num_people = self.current_index = reader.count
+            self.frame_plot.create_plot(self.people_data)
+            self.show_frame(self.frame_plot)
+
+        if reader.n_chunks > 1:
+            self.after(1, self._load_next_chunk, reader, 1)
+        else:
+            self._finish_restore()
+
+    def _load_next_chunk(self, reader: SessionReader, i: int):
+        if reader is not self._restoring:
+            return  # restauration annulée (nouvelle saisie, autre session…)
+        try:
+            people = people_from_arrays(*reader.read_chunk(i))
+        except Exception as e:
+            self._cancel_restore()
+            messagebox.showerror(
+                "Session",
+                f"Lecture de la session interrompue :\n{e}\n\n"
+                f"{len(self.people_data)} personne(s) sur {reader.count} ont été chargées.",
+            )
+            return
+        self.people_data.extend(people)
+        if i + 1 < reader.n_chunks:
+            self.after(1, self._load_next_chunk, reader, i + 1)
+        else:
+            if self.frame_plot.winfo_ismapped():
+                self.frame_plot.create_plot(self.people_data)
+            self._finish_restore()
+
+    def _finish_restore(self):
+        self._cancel_restore()
+        # Les modifications faites pendant le chargement n'ont pas été sauvegardées
+        self.mark_dirty()
+
+    def _cancel_restore(self):
+        if self._restoring is not None:
+            self._restoring.close()
+            self._restoring = None
+
     def show_frame(self, frame: ttk.Frame):
-        for f in (self.frame_start, self.frame_form, self.frame_plot):
+        for f in (self.frame_start, self.frame_form, self.frame_bulk, self.frame_plot, self.frame_profiles):
             f.pack_forget()
         frame.pack(fill="both", expand=True)
 
     def go_to_form(self, nb: int):
+        self._cancel_restore()
         self.num_people = nb
         self.current_index = 0
         self.people_data.clear()
@@ -81,7 +222,7 @@ class WizardApp(tk.Tk):
         self.show_frame(self.frame_form)
 
     def save_person_data(self, name: str, scores: Dict[str, int]):
-        x_val, y_val = apply_transformations_and_get_coordinates(scores)
+        x_val, y_val = default_cache.coordinates(scores)
         x_val = _clamp(float(x_val), -4.0, 4.0)
         y_val = _clamp(float(y_val), -4.0, 4.0)
         self.people_data.append({"name": name, "scores": scores, "x": x_val, "y": y_val})
@@ -93,6 +234,17 @@ class WizardApp(tk.Tk):
         else:
             self.frame_plot.create_plot(self.people_data)
             self.show_frame(self.frame_plot)
+        self.mark_dirty()
+
+    def show_people(self, people: List[dict]):
+        """Remplace les personnes saisies (import groupé) et affiche directement le graphique."""
+        self._cancel_restore()
+        self.people_data[:] = people
+        self.num_people = len(people)
+        self.current_index = len(people)
+        self.frame_plot.create_plot(self.people_data)
+        self.show_frame(self.frame_plot)
+        self.mark_dirty()
 
 
 # ============================================================
@@ -123,6 +275,14 @@ class StartFrame(ttk.Frame):
         self.btn = ttk.Button(self, text="Commencer", command=self.on_next)
         self.btn.pack(pady=20)
 
+        ttk.Label(self, text="Séance de groupe ?", style="Subtitle.TLabel").pack(pady=(10, 4))
+        ttk.Button(
+            self,
+            text="Import groupé (fichier de scores ou dossier de captures)",
+            command=lambda: self.app.show_frame(self.app.frame_bulk),
+        ).pack()
+        ttk.Button(self, text="Ouvrir une session…", command=self.open_session).pack(pady=(8, 0))
+
         # Entrée => Commencer
         self.entry.bind("<Return>", lambda e: self.on_next())
 
@@ -136,6 +296,14 @@ class StartFrame(ttk.Frame):
             return
         self.app.go_to_form(n)
 
+    def open_session(self):
+        path = filedialog.askopenfilename(
+            title="Ouvrir une session",
+            filetypes=[("Session Politiscales", "*.pss"), ("Tous les fichiers", "*.*")],
+        )
+        if path:
+            self.app.open_session(path)
+
 
 # ============================================================
 #  PAGE 2 — Saisie + OCR
@@ -184,16 +352,7 @@ class FormFrame(ttk.Frame):
         self.btn_ocr = ttk.Button(name_block, text="Importer depuis une capture Politiscales (OCR)", command=self.import_from_screenshot)
         self.btn_ocr.grid(row=1, column=0, columnspan=2, pady=(5, 0), sticky="w")
 
-        self.var_list = [
-            "constructivisme", "essentialisme",
-            "justice_rehabilitative", "justice_punitive",
-            "progressisme", "conservatisme",
-            "internationalisme", "nationalisme",
-            "communisme", "capitalisme",
-            "regulation", "laissez_faire",
-            "ecologie", "productivisme",
-            "revolution", "reformisme",
-        ]
+        self.var_list = list(VARIABLES)
 
         self.entries: Dict[str, ttk.Entry] = {}
         fields = ttk.Frame(self.inner_frame)
@@ -238,7 +397,8 @@ class FormFrame(ttk.Frame):
             return
 
         try:
-            scores = extract_scores_from_image(path)
+            # Capture brute d'abord ; image prétraitée seulement si la lecture échoue
+            scores = extract_scores(path, PreprocessConfig())
         except Exception as e:
             messagebox.showerror("Erreur OCR", str(e))
             return
@@ -261,22 +421,267 @@ class FormFrame(ttk.Frame):
         if not name:
             name = f"Personne_{self.app.current_index + 1}"
 
-        scores: Dict[str, int] = {}
-        try:
-            for key, ent in self.entries.items():
-                v = ent.get().strip() or "0"
-                v_int = int(v)
-                if not (0 <= v_int <= 100):
-                    raise ValueError
-                scores[key] = v_int
-        except Exception:
-            messagebox.showerror("Erreur", "Tous les scores doivent être des entiers entre 0 et 100.")
+        scores, errors, warnings = parse_form_fields({key: ent.get() for key, ent in self.entries.items()})
+        if errors:
+            messagebox.showerror(
+                "Erreur",
+                "Tous les scores doivent être des entiers entre 0 et 100.\n\n" + "\n".join(errors),
+            )
+            return
+        if warnings and not messagebox.askyesno(
+            "Scores inhabituels",
+            "Pôle A + pôle B dépasse 100 pour :\n\n" + "\n".join(warnings) + "\n\nEnregistrer quand même ?",
+        ):
             return
 
         self.app.save_person_data(name, scores)
         self.app.next_person()
 
 
+# ============================================================
+#  PAGE 2 bis — Import groupé
+# ============================================================
+
+class VirtualTable(ttk.Frame):
+    """
+    Table en lecture seule virtualisée : seules les lignes visibles ont des widgets,
+    réutilisés au défilement. Les valeurs sont demandées à get_row(i) à l'affichage.
+    """
+
+    def __init__(self, parent, columns: List[Tuple[str, int]], row_height: int = 22):
+        super().__init__(parent)
+        self.columns = columns
+        self.row_height = row_height
+        self.row_count = 0
+        self.get_row: Callable[[int], Tuple[str, ...]] = lambda i: ()
+        self.first = 0
+        self._rows: List[List[ttk.Label]] = []
+
+        header = ttk.Frame(self)
+        header.pack(fill="x")
+        x = 0
+        for title, width in columns:
+            lbl = ttk.Label(header, text=title, anchor="w", font=("Segoe UI", 10, "bold"))
+            lbl.place(x=x, y=0, width=width, height=row_height)
+            x += width
+        header.configure(height=row_height)
+
+        body = ttk.Frame(self)
+        body.pack(fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.rows_frame = ttk.Frame(body)
+        self.rows_frame.pack(side="left", fill="both", expand=True)
+
+        self.rows_frame.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.rows_frame)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.scroll(int(-e.delta / 120) * 3))
+        widget.bind("<Button-4>", lambda e: self.scroll(-3))
+        widget.bind("<Button-5>", lambda e: self.scroll(3))
+
+    @property
+    def visible_rows(self) -> int:
+        return len(self._rows)
+
+    def set_data(self, row_count: int, get_row: Callable[[int], Tuple[str, ...]]):
+        self.row_count = row_count
+        self.get_row = get_row
+        self.first = 0
+        self.refresh()
+
+    def _on_resize(self, event):
+        wanted = max(1, event.height // self.row_height)
+        while len(self._rows) < wanted:
+            r = len(self._rows)
+            labels = []
+            x = 0
+            for _, width in self.columns:
+                lbl = ttk.Label(self.rows_frame, anchor="w")
+                lbl.place(x=x, y=r * self.row_height, width=width, height=self.row_height)
+                self._bind_wheel(lbl)
+                labels.append(lbl)
+                x += width
+            self._rows.append(labels)
+        while len(self._rows) > wanted:
+            for lbl in self._rows.pop():
+                lbl.destroy()
+        self.scroll(0)
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * self.row_count))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.visible_rows if args[2] == "pages" else 1)
+            self.scroll(step)
+
+    def scroll(self, delta: int):
+        self.scroll_to(self.first + delta)
+
+    def scroll_to(self, first: int):
+        self.first = max(0, min(first, self.row_count - self.visible_rows))
+        self.refresh()
+
+    def refresh(self):
+        empty = ("",) * len(self.columns)
+        for r, labels in enumerate(self._rows):
+            i = self.first + r
+            values = self.get_row(i) if i < self.row_count else empty
+            for lbl, v in zip(labels, values):
+                lbl.configure(text=v)
+        if self.row_count:
+            self.scrollbar.set(self.first / self.row_count, min(1.0, (self.first + self.visible_rows) / self.row_count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+
+class BulkFrame(ttk.Frame):
+    def __init__(self, parent, app: WizardApp):
+        super().__init__(parent)
+        self.app = app
+
+        ttk.Label(self, text="Import groupé", style="Title.TLabel").pack(anchor="w")
+        ttk.Label(
+            self,
+            text="Chargez un fichier de scores (CSV, TSV, Parquet) ou un dossier de captures Politiscales.",
+            style="Subtitle.TLabel",
+        ).pack(anchor="w", pady=(0, 10))
+
+        ctrl = ttk.Frame(self)
+        ctrl.pack(fill="x", pady=(0, 8))
+        self.btn_file = ttk.Button(ctrl, text="Charger un fichier de scores…", command=self.load_file)
+        self.btn_file.pack(side="left")
+        self.btn_folder = ttk.Button(ctrl, text="Charger un dossier de captures (OCR)…", command=self.load_folder)
+        self.btn_folder.pack(side="left", padx=8)
+        self.preprocess_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            ctrl,
+            text="Prétraiter les captures difficiles (photos, mode sombre…)",
+            variable=self.preprocess_var,
+        ).pack(side="left", padx=8)
+        ttk.Button(ctrl, text="Retour", command=lambda: self.app.show_frame(self.app.frame_start)).pack(side="right")
+
+        self.status_label = ttk.Label(self, text="Aucune donnée chargée.")
+        self.status_label.pack(anchor="w", pady=(0, 6))
+
+        self.table = VirtualTable(self, [("#", 60), ("Prénom", 240), ("x", 80), ("y", 80), ("Statut", 420)])
+        self.table.pack(fill="both", expand=True)
+
+        self.btn_plot = ttk.Button(self, text="Afficher le graphique", command=self.go_to_plot, state="disabled")
+        self.btn_plot.pack(pady=12)
+
+        self._result: Optional[IngestResult] = None
+        self._coords = np.zeros((0, 2))
+        self._messages: Dict[int, str] = {}
+        self._job: Optional[dict] = None
+
+    # ---------- chargement (thread de fond, suivi par after) ----------
+
+    def _run_in_background(self, label: str, fn: Callable[[Callable[[int, int], None]], IngestResult]):
+        job = {"done": False, "result": None, "error": None, "progress": (0, 0)}
+
+        def progress(i: int, n: int):
+            job["progress"] = (i, n)
+
+        def worker():
+            try:
+                job["result"] = fn(progress)
+            except Exception as e:
+                job["error"] = e
+            job["done"] = True
+
+        self._job = job
+        self.btn_file.configure(state="disabled")
+        self.btn_folder.configure(state="disabled")
+        self.btn_plot.configure(state="disabled")
+        self.status_label.config(text=label)
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(100, self._poll, label)
+
+    def _poll(self, label: str):
+        job = self._job
+        if not job["done"]:
+            i, n = job["progress"]
+            if n:
+                self.status_label.config(text=f"{label} {i}/{n}")
+            self.after(100, self._poll, label)
+            return
+
+        self.btn_file.configure(state="normal")
+        self.btn_folder.configure(state="normal")
+        if job["error"] is not None:
+            self.status_label.config(text="Échec du chargement.")
+            messagebox.showerror("Import groupé", str(job["error"]))
+            return
+        self._show_result(job["result"])
+
+    def load_file(self):
+        path = filedialog.askopenfilename(
+            title="Choisir un fichier de scores",
+            filetypes=[("Scores", "*.csv;*.tsv;*.txt;*.parquet;*.npz"), ("Tous les fichiers", "*.*")],
+        )
+        if path:
+            self._run_in_background("Lecture du fichier…", lambda progress: read_scores(path))
+
+    def load_folder(self):
+        folder = filedialog.askdirectory(title="Choisir un dossier de captures Politiscales")
+        if not folder:
+            return
+        paths = list_images(folder)
+        if not paths:
+            messagebox.showwarning("Import groupé", "Aucune image trouvée dans ce dossier.")
+            return
+        config = PreprocessConfig() if self.preprocess_var.get() else None
+        self._run_in_background("Extraction OCR…",
+                                lambda progress: extract_images(paths, progress=progress, preprocess=config))
+
+    # ---------- résultats ----------
+
+    def _show_result(self, result: IngestResult):
+        # Un seul passage vectorisé pour toutes les lignes valides (profils identiques calculés une fois)
+        coords = np.full((result.n_rows, 2), np.nan)
+        idx = np.flatnonzero(result.valid)
+        before = default_cache.stats()
+        if len(idx):
+            coords[idx] = batch_coordinates(result.scores[idx], clamp=True, cache=default_cache)
+        after = default_cache.stats()
+        unique = after["batch_unique"] - before["batch_unique"]
+        deduplicated = after["batch_rows"] - before["batch_rows"] if unique else 0
+
+        messages: Dict[int, str] = {}
+        for e in result.errors:
+            r = int(np.searchsorted(result.lines, e.line))
+            if r < result.n_rows and r not in messages:
+                messages[r] = f"{e.column} : {e.message}" if e.column else e.message
+
+        self._result = result
+        self._coords = coords
+        self._messages = messages
+        self.table.set_data(result.n_rows, self._table_row)
+
+        text = f"{result.n_rows} ligne(s) : {result.n_valid} valide(s), {result.n_invalid} invalide(s)."
+        if deduplicated:
+            text += f" {unique} profil(s) distinct(s)."
+        self.status_label.config(text=text)
+        self.btn_plot.configure(state="normal" if result.n_valid else "disabled")
+
+    def _table_row(self, i: int) -> Tuple[str, ...]:
+        r = self._result
+        if r.valid[i]:
+            x, y = self._coords[i]
+            return (str(i + 1), r.names[i], f"{x:.2f}", f"{y:.2f}", "OK")
+        return (str(i + 1), r.names[i], "—", "—", self._messages.get(i, "invalide"))
+
+    def go_to_plot(self):
+        r = self._result
+        if r is None or not r.n_valid:
+            return
+        idx = np.flatnonzero(r.valid)
+        people = people_from_arrays([r.names[i] for i in idx], r.scores[idx], self._coords[idx])
+        self.app.show_people(people)
+
+
 # ============================================================
 #  PAGE 3 — Graphique + Filtre Personnalités
 # ============================================================
@@ -316,23 +721,80 @@ class PlotFrame(ttk.Frame):
 
         ttk.Label(ctrl, text="(Entrée = appliquer)").pack(side="left", padx=(8, 0))
 
+        self.uncertainty_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            ctrl,
+            text="Incertitude ± (points)",
+            variable=self.uncertainty_var,
+            command=self.apply_filter,
+        ).pack(side="left", padx=(16, 4))
+        self.sigma_var = tk.StringVar(value="3")
+        sigma_spin = ttk.Spinbox(ctrl, from_=1, to=20, width=4, textvariable=self.sigma_var, command=self.apply_filter)
+        sigma_spin.pack(side="left")
+
+        ttk.Label(ctrl, text="Plan :").pack(side="left", padx=(16, 4))
+        self.plane_var = tk.StringVar(value=PLANE_LABELS[CLASSIC_KEY])
+        self.plane_combo = ttk.Combobox(
+            ctrl,
+            textvariable=self.plane_var,
+            state="readonly",
+            width=28,
+            values=list(PLANE_LABELS.values()),
+        )
+        self.plane_combo.pack(side="left")
+        self.plane_combo.bind("<<ComboboxSelected>>", lambda e: self.change_plane())
+        # Plan ajusté : personnalités de référence placées ou non (profil de scores requis)
+        self.plane_note = ttk.Label(ctrl, text="", foreground="gray")
+        self.plane_note.pack(side="left", padx=(8, 0))
+
         graph = ttk.Frame(self)
         graph.pack(fill="both", expand=True)
 
-        self.fig, self.ax = plt.subplots(figsize=(7.6, 6.8))
+        self.fig, self.ax = plt.subplots(figsize=FIGSIZE)
         self.canvas = FigureCanvasTkAgg(self.fig, master=graph)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
         toolbar = ttk.Frame(graph)
         toolbar.pack(fill="x")
-        NavigationToolbar2Tk(self.canvas, toolbar)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, toolbar)
 
         bottom = ttk.Frame(self)
         bottom.pack(fill="x", pady=(8, 0))
         self.btn_save = ttk.Button(bottom, text="Télécharger le graphique (PNG)", command=self.save_figure)
         self.btn_save.pack(side="left")
+        self.btn_session = ttk.Button(bottom, text="Enregistrer la session…", command=self.save_session)
+        self.btn_session.pack(side="left", padx=(8, 0))
+        self.btn_profiles = ttk.Button(bottom, text="Vue par axes…", command=self.show_profiles)
+        self.btn_profiles.pack(side="left", padx=(8, 0))
+        self.btn_export = ttk.Button(bottom, text="Exporter les données…", command=self.export_data)
+        self.btn_export.pack(side="left", padx=(8, 0))
+        self.selection_label = ttk.Label(bottom, text="Cliquez sur un point ou une ellipse pour le sélectionner.")
+        self.selection_label.pack(side="left", padx=(12, 0))
 
         self._people_data_cache: List[dict] = []
+        self._uncertainty_cache: "OrderedDict[Tuple[str, float], tuple]" = OrderedDict()
+
+        # Plans : chaque plan ajusté (projection, personnes, personnalités, index) est calculé une fois
+        self._score_matrix: Optional[np.ndarray] = None
+        self._planes: Dict[str, tuple] = {}
+        self._plane_key = CLASSIC_KEY
+        self._projection: Optional[LinearProjection] = None
+        self._view_people: List[dict] = []
+        self._view_personalities: List[PersonalityPoint] = []
+
+        # Survol / sélection : index spatiaux + blitting des artistes animés
+        self._people_index: Optional[RegionIndex] = None
+        self._overlay_points: List[PersonalityPoint] = []
+        self._overlay_index: Optional[EllipseIndex] = None
+        self._blit_background = None
+        self._pending_motion = None
+        self._motion_job = None
+        self._hover_key = None
+        self._selected = None
+
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("motion_notify_event", self._on_motion)
+        self.canvas.mpl_connect("button_press_event", self._on_click)
 
         # Entrée => appliquer filtre (quand frame visible)
         self.bind_all("<Return>", self._on_enter_plot, add="+")
@@ -344,83 +806,396 @@ class PlotFrame(ttk.Frame):
 
     def create_plot(self, people: List[dict]):
         self._people_data_cache = people[:]
+        self._uncertainty_cache.clear()
+        self._score_matrix = None
+        self._planes.clear()
+        self._selected = None
+        try:
+            self._activate_plane()
+        except ValueError:
+            self.plane_var.set(PLANE_LABELS[CLASSIC_KEY])
+            self._activate_plane()
         self._redraw_all()
 
-    def _draw_base(self):
-        self.ax.clear()
-        self.ax.set_xlim(-4, 4)
-        self.ax.set_ylim(-4, 4)
-
-        # Quadrants clairs, lisibles
-        self.ax.add_patch(Rectangle((-4, 0), 4, 4, color="#ffcccc", alpha=0.22, zorder=0))   # haut-gauche
-        self.ax.add_patch(Rectangle((0, 0), 4, 4, color="#ccffcc", alpha=0.22, zorder=0))    # haut-droit
-        self.ax.add_patch(Rectangle((-4, -4), 4, 4, color="#ccccff", alpha=0.22, zorder=0))  # bas-gauche
-        self.ax.add_patch(Rectangle((0, -4), 4, 4, color="#ffffcc", alpha=0.22, zorder=0))   # bas-droit
+    # ---------- plans ----------
+
+    def _selected_plane(self) -> str:
+        label = self.plane_var.get()
+        return next((k for k, v in PLANE_LABELS.items() if v == label), CLASSIC_KEY)
+
+    def _build_plane(self, key: str) -> tuple:
+        people = self._people_data_cache
+        if key == CLASSIC_KEY:
+            xy = np.array([(p["x"], p["y"]) for p in people], dtype=np.float64).reshape(-1, 2)
+            return None, people, self.app.personalities, RegionIndex(xy)
+
+        matrix = self.score_matrix()
+        projection = fit_projection(key, matrix)
+        xy = projection.transform(matrix)
+        view = [{**p, "x": float(x), "y": float(y)} for p, (x, y) in zip(people, xy)]
+        return projection, view, project_personalities(self.app.personalities, projection), RegionIndex(xy)
+
+    def score_matrix(self) -> np.ndarray:
+        """Scores (N, 16) des personnes affichées, calculés une fois (partagés avec ProfileFrame)."""
+        if self._score_matrix is None:
+            self._score_matrix = scores_to_matrix(p["scores"] for p in self._people_data_cache)
+        return self._score_matrix
+
+    def people(self) -> List[dict]:
+        return self._people_data_cache
+
+    def selected_person(self) -> Optional[int]:
+        if self._selected is not None and self._selected[0] == "person":
+            return self._selected[1]
+        return None
+
+    def show_profiles(self):
+        self.app.show_frame(self.app.frame_profiles)
+        self.app.frame_profiles.refresh()
+
+    def _activate_plane(self):
+        key = self._selected_plane()
+        if key not in self._planes:
+            self._planes[key] = self._build_plane(key)
+        self._plane_key = key
+        self._projection, self._view_people, self._view_personalities, self._people_index = self._planes[key]
+        self.plane_note.config(text=self._plane_note())
+
+    def _plane_note(self) -> str:
+        if self._projection is None:
+            return ""
+        placed, total = len(self._view_personalities), len(self.app.personalities)
+        if placed == 0:
+            return "Personnalités de référence indisponibles dans ce plan (aucun profil de scores connu)."
+        if placed < total:
+            return f"{placed} personnalité(s) sur {total} placée(s) (profil de scores connu), sans ellipse."
+        return "Personnalités placées sans ellipse d'incertitude dans ce plan."
+
+    def change_plane(self):
+        try:
+            self._activate_plane()
+        except ValueError as e:
+            messagebox.showwarning("Plan", f"Impossible d'ajuster ce plan :\n{e}")
+            self.plane_var.set(PLANE_LABELS[self._plane_key])
+            return
+        self._selected = None
+        self._redraw_all()
+        self.app.mark_dirty()
 
-        self.ax.axhline(0, color="black", linewidth=1.2, zorder=3)
-        self.ax.axvline(0, color="black", linewidth=1.2, zorder=3)
-        self.ax.grid(True, linestyle="--", alpha=0.35, zorder=1)
+    # ---------- dessin ----------
 
-        self.ax.set_xlabel("Économique : Gauche (x < 0)  |  Droite (x > 0)", fontsize=9)
-        self.ax.set_ylabel("Sociétal   : Libertaire (y < 0)  |  Autoritaire (y > 0)", fontsize=9)
+    def _draw_base(self):
+        if self._projection is None:
+            draw_base(self.ax)
+        else:
+            draw_base(self.ax, self._projection.axis_labels())
 
     def _draw_people(self):
-        for p in self._people_data_cache:
-            color = "#%06x" % random.randint(0, 0xFFFFFF)
-            self.ax.plot(p["x"], p["y"], marker="x", color=color, markersize=8, linewidth=2, zorder=6)
-            self.ax.text(p["x"], p["y"], " " + p["name"], color=color, fontsize=9, zorder=7)
+        draw_people(self.ax, self._view_people)
 
     def _draw_personalities_overlay(self):
-        selection = (self.filter_var.get() or "Aucun").strip()
+        draw_personalities_overlay(self.ax, self._view_personalities, self.filter_var.get())
+
+        self._overlay_points = select_personalities(self._view_personalities, self.filter_var.get())
+        axes = [ellipse_half_axes(p) for p in self._overlay_points]
+        self._overlay_index = EllipseIndex(
+            [(p.x, p.y) for p in self._overlay_points],
+            [a for a, _ in axes],
+            [b for _, b in axes],
+        )
 
-        if selection == "Aucun":
+    def _draw_people_uncertainty(self):
+        if not self.uncertainty_var.get():
+            return
+        try:
+            sigma = float(self.sigma_var.get())
+        except ValueError:
+            return
+        people = [p for p in self._view_people if "scores" in p]
+        if not people or sigma <= 0:
             return
 
-        if selection == "Tous":
-            pts = self.app.personalities
+        key = (self._plane_key, sigma)
+        ellipses = self._uncertainty_cache.get(key)
+        if ellipses is not None:
+            self._uncertainty_cache.move_to_end(key)
         else:
-            pts = [p for p in self.app.personalities if p.category.lower() == selection.lower()]
-
-        # Ellipses grises légères : tu peux customiser ensuite (couleur par catégorie)
-        for p in pts:
-            ux = _clamp(float(p.ux), 0.15, 1.2)
-            uy = _clamp(float(p.uy), 0.15, 1.2)
-
-            ell = Ellipse(
-                (p.x, p.y),
-                width=2 * ux,
-                height=2 * uy,
-                alpha=0.18,
-                linewidth=1.1,
-                edgecolor="black",
-                facecolor="gray",
-                zorder=2,
-            )
-            self.ax.add_patch(ell)
-            self.ax.text(
-                p.x,
-                p.y,
-                p.name,
-                fontsize=8,
-                ha="center",
-                va="center",
-                color="black",
-                alpha=0.85,
-                zorder=4,
-            )
+            if self._projection is None:
+                _, cov = propagate(scores_to_matrix(p["scores"] for p in people), sigma=sigma, method="linear")
+            else:
+                # Projection linéaire : même covariance pour tous les répondants
+                cov = np.broadcast_to(self._projection.noise_covariance(sigma), (len(people), 2, 2))
+            ellipses = covariance_to_ellipse(cov)
+            self._uncertainty_cache[key] = ellipses
+            while len(self._uncertainty_cache) > UNCERTAINTY_CACHE_SIZE:
+                self._uncertainty_cache.popitem(last=False)
+        draw_uncertainty_ellipses(self.ax, people, *ellipses)
 
     def _redraw_all(self):
         self._draw_base()
         self._draw_personalities_overlay()
+        self._draw_people_uncertainty()
         self._draw_people()
+        self._init_hover_artists()
         self.fig.tight_layout()
         self.canvas.draw()
 
     def apply_filter(self):
         self._redraw_all()
+        self.app.mark_dirty()
+
+    def get_state(self) -> dict:
+        return {
+            "overlay": self.filter_var.get(),
+            "uncertainty": bool(self.uncertainty_var.get()),
+            "sigma": self.sigma_var.get(),
+            "plane": self._selected_plane(),
+        }
+
+    def set_state(self, state: dict):
+        self.filter_var.set(state.get("overlay", "Aucun"))
+        self.uncertainty_var.set(bool(state.get("uncertainty", False)))
+        self.sigma_var.set(str(state.get("sigma", "3")))
+        self.plane_var.set(PLANE_LABELS.get(state.get("plane", CLASSIC_KEY), PLANE_LABELS[CLASSIC_KEY]))
+
+    def save_session(self):
+        f = filedialog.asksaveasfilename(defaultextension=".pss", filetypes=[("Session Politiscales", "*.pss")])
+        if f:
+            self.app.save_session(f)
+            messagebox.showinfo("Session", f"Session sauvegardée dans : {f}")
+
+    # ---------- survol / sélection ----------
+
+    def _init_hover_artists(self):
+        # Artistes animés : exclus du rendu normal, redessinés seuls par blitting
+        self._tooltip = self.ax.annotate(
+            "",
+            xy=(0, 0),
+            xytext=(12, 12),
+            textcoords="offset points",
+            fontsize=9,
+            bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", alpha=0.95),
+            zorder=10,
+            animated=True,
+            visible=False,
+        )
+        (self._highlight,) = self.ax.plot(
+            [], [], marker="o", markersize=14, markerfacecolor="none",
+            markeredgecolor="black", markeredgewidth=1.6, zorder=9, animated=True,
+        )
+        self._hover_key = None
+
+    def _on_draw(self, event):
+        self._blit_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._blit()
+
+    def _blit(self):
+        if self._blit_background is None:
+            return
+        self.canvas.restore_region(self._blit_background)
+        self.ax.draw_artist(self._highlight)
+        self.ax.draw_artist(self._tooltip)
+        self.canvas.blit(self.fig.bbox)
+
+    def _hit_test(self, x: float, y: float):
+        """Personne sous le curseur (tolérance en pixels), sinon ellipse de personnalité."""
+        if self._people_index is not None and len(self._people_index):
+            bbox = self.ax.get_window_extent()
+            x0, x1 = self.ax.get_xlim()
+            y0, y1 = self.ax.get_ylim()
+            scale = (bbox.width / (x1 - x0), bbox.height / (y1 - y0))
+            i = self._people_index.nearest(x, y, HOVER_TOLERANCE_PX, scale)
+            if i is not None:
+                return ("person", i)
+        if self._overlay_index is not None and len(self._overlay_index):
+            j = self._overlay_index.hit(x, y)
+            if j is not None:
+                return ("personality", j)
+        return None
+
+    def _describe(self, key) -> Tuple[str, float, float]:
+        kind, i = key
+        if kind == "person":
+            p = self._view_people[i]
+            return f"{p['name']}\n(x={p['x']:.2f}, y={p['y']:.2f})", p["x"], p["y"]
+        p = self._overlay_points[i]
+        return f"{p.name} — {p.category}\n(x={p.x:.2f}, y={p.y:.2f})", p.x, p.y
+
+    def _on_motion(self, event):
+        # Limitation : un seul traitement par image (~16 ms), sur la dernière position connue
+        self._pending_motion = (event.inaxes is self.ax, event.xdata, event.ydata)
+        if self._motion_job is None:
+            self._motion_job = self.after(HOVER_INTERVAL_MS, self._process_motion)
+
+    def _process_motion(self):
+        self._motion_job = None
+        if self._pending_motion is None or self.toolbar.mode:
+            return
+        inside, x, y = self._pending_motion
+        self._pending_motion = None
+
+        key = self._hit_test(x, y) if inside and x is not None else None
+        if key == self._hover_key:
+            return
+        self._hover_key = key
+
+        if key is None:
+            self._tooltip.set_visible(False)
+        else:
+            text, px, py = self._describe(key)
+            self._tooltip.xy = (px, py)
+            self._tooltip.set_text(text)
+            self._tooltip.set_visible(True)
+        self._blit()
+
+    def _on_click(self, event):
+        if event.inaxes is not self.ax or event.button != 1 or self.toolbar.mode:
+            return
+        key = self._hit_test(event.xdata, event.ydata)
+        self._selected = key
+        if key is None:
+            self._highlight.set_data([], [])
+            text = "Aucune sélection."
+            if self._projection is None and self._people_index is not None and len(self._people_index):
+                q = self._people_index.quadrant_counts()
+                text += (f" Quadrants — gauche autoritaire : {q['gauche_autoritaire']}, droite autoritaire : "
+                         f"{q['droite_autoritaire']}, gauche libertaire : {q['gauche_libertaire']}, "
+                         f"droite libertaire : {q['droite_libertaire']}")
+            self.selection_label.config(text=text)
+        else:
+            text, px, py = self._describe(key)
+            self._highlight.set_data([px], [py])
+            label = "Sélection : " + text.replace("\n", " ")
+            if key[0] == "person" and self._view_personalities:
+                near = ", ".join(p.name for p, _ in nearest_personalities(px, py, k=3, personalities=self._view_personalities))
+                label += f" — proches : {near}"
+            elif key[0] == "personality" and self._people_index is not None \
+                    and has_uncertainty(self._overlay_points[key[1]]):
+                p = self._overlay_points[key[1]]
+                inside = self._people_index.count(EllipseRegion(p.x, p.y, *ellipse_half_axes(p)))
+                label += f" — {inside} répondant(s) dans l'ellipse"
+            self.selection_label.config(text=label)
+        self._blit()
+
+    def export_data(self):
+        f = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV", "*.csv"),
+                ("CSV compressé", "*.csv.gz"),
+                ("JSON Lines", "*.jsonl"),
+                ("JSON Lines compressé", "*.jsonl.gz"),
+                ("Colonnes compressées Politiscales", "*.psc"),
+            ],
+        )
+        if not f:
+            return
+
+        # Export sur un thread : les personnes sont converties et écrites bloc par bloc
+        people = list(self._people_data_cache)
+        job = {"done": False, "rows": 0, "error": None}
+
+        def worker():
+            try:
+                export_people(f, iter_people_chunks(people), workers=max(1, (os.cpu_count() or 2) - 1),
+                              progress=lambda n: job.update(rows=n))
+            except Exception as e:
+                job["error"] = e
+            job["done"] = True
+
+        self.btn_export.configure(state="disabled")
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(100, self._poll_export, job, f, len(people))
+
+    def _poll_export(self, job: dict, path: str, total: int):
+        if not job["done"]:
+            self.selection_label.config(text=f"Export en cours… {job['rows']}/{total}")
+            self.after(100, self._poll_export, job, path, total)
+            return
+        self.btn_export.configure(state="normal")
+        if job["error"] is not None:
+            self.selection_label.config(text="Échec de l'export.")
+            messagebox.showerror("Export", str(job["error"]))
+        else:
+            self.selection_label.config(text=f"{total} personne(s) exportée(s).")
+            messagebox.showinfo("Export", f"Données exportées dans : {path}")
 
     def save_figure(self):
         f = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG", "*.png")])
         if f:
             self.fig.savefig(f, dpi=300)
             messagebox.showinfo("Image", f"Graphique sauvegardé dans : {f}")
+
+
+# ============================================================
+#  VUE PAR AXES (RADAR / COORDONNÉES PARALLÈLES)
+# ============================================================
+
+PROFILE_VIEWS = ("Coordonnées parallèles", "Radar")
+
+
+class ProfileFrame(ttk.Frame):
+    """Scores des 16 variables, sur les mêmes personnes que PlotFrame (et la même sélection)."""
+
+    def __init__(self, parent, app: WizardApp):
+        super().__init__(parent)
+        self.app = app
+
+        ttk.Label(self, text="Profils sur les 16 variables", style="Title.TLabel").pack(anchor="w")
+        ttk.Label(
+            self,
+            text="Paires de pôles opposés côte à côte ; la personne sélectionnée sur le plan est surlignée.",
+            style="Subtitle.TLabel",
+        ).pack(anchor="w", pady=(0, 6))
+
+        ctrl = ttk.Frame(self)
+        ctrl.pack(fill="x", pady=(0, 8))
+        ttk.Label(ctrl, text="Vue :").pack(side="left", padx=(0, 8))
+        self.view_var = tk.StringVar(value=PROFILE_VIEWS[0])
+        view_combo = ttk.Combobox(ctrl, textvariable=self.view_var, state="readonly", width=24, values=PROFILE_VIEWS)
+        view_combo.pack(side="left")
+        view_combo.bind("<<ComboboxSelected>>", lambda e: self.refresh())
+        self.status_label = ttk.Label(ctrl, text="")
+        self.status_label.pack(side="left", padx=(12, 0))
+        ttk.Button(ctrl, text="Retour au plan", command=lambda: self.app.show_frame(self.app.frame_plot)).pack(side="right")
+
+        graph = ttk.Frame(self)
+        graph.pack(fill="both", expand=True)
+        self.fig = plt.figure(figsize=FIGSIZE)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=graph)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        toolbar = ttk.Frame(graph)
+        toolbar.pack(fill="x")
+        NavigationToolbar2Tk(self.canvas, toolbar)
+
+        # Image de densité réutilisée tant que la matrice de scores ne change pas
+        self._density_for: Optional[np.ndarray] = None
+        self._density: Optional[np.ndarray] = None
+
+    def refresh(self):
+        plot = self.app.frame_plot
+        matrix = plot.score_matrix()
+        people = plot.people()
+        sel = plot.selected_person()
+        highlight = matrix[sel] if sel is not None else None
+
+        self.fig.clear()
+        if self.view_var.get() == "Radar":
+            ax = self.fig.add_subplot(projection="polar")
+            mode = draw_radar(ax, matrix, [p["name"] for p in people[:len(matrix)]], highlight)
+        else:
+            ax = self.fig.add_subplot()
+            density = None
+            if len(matrix) > PARALLEL_LINE_LIMIT:
+                if self._density_for is not matrix:
+                    self._density = parallel_density(matrix)
+                    self._density_for = matrix
+                density = self._density
+            mode = draw_parallel(ax, matrix, highlight, density)
+
+        text = f"{len(matrix)} personne(s) — rendu {mode}"
+        if sel is not None:
+            text += f" — sélection : {people[sel]['name']}"
+        self.status_label.config(text=text)
+        self.fig.tight_layout()
+        self.canvas.draw()
@@ -0,0 +1,119 @@
+# uncertainty.py
+"""
+Propagation de l'incertitude des scores (OCR, auto-déclaration) à travers le modèle de coordonnées.
+
+Deux méthodes :
+  - "linear"     : linéarisation, cov = J Σ Jᵀ avec J (2×16) estimée par différences finies centrées ;
+  - "montecarlo" : tirages bruités (échantillons × répondants) évalués en un seul appel vectorisé par bloc.
+
+Les deux travaillent par blocs de lignes pour borner la mémoire sur de grandes populations.
+"""
+from __future__ import annotations
+
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from model import VARIABLES, coordinates_batch
+
+
+SigmaLike = Union[float, np.ndarray]
+
+# Nombre max de lignes (N × échantillons) évaluées par appel au modèle.
+MAX_ROWS_PER_CALL = 1 << 20
+
+
+def _sigma_matrix(sigma: SigmaLike, n: int) -> np.ndarray:
+    """Écart-type en points de score, diffusé en (N, 16)."""
+    s = np.asarray(sigma, dtype=np.float64)
+    try:
+        return np.broadcast_to(s, (n, len(VARIABLES)))
+    except ValueError:
+        raise ValueError(f"sigma doit être un scalaire, un vecteur de {len(VARIABLES)} valeurs ou une matrice (N, 16).")
+
+
+def _linear(matrix: np.ndarray, sigma: np.ndarray, step: float) -> Tuple[np.ndarray, np.ndarray]:
+    n, d = matrix.shape
+    base = matrix.astype(np.float64)
+
+    # 2·d perturbations par ligne, évaluées en un seul appel : (2d, n, 16) -> (2d·n, 16)
+    pert = np.broadcast_to(base, (2 * d, n, d)).copy()
+    for j in range(d):
+        pert[2 * j, :, j] += step
+        pert[2 * j + 1, :, j] -= step
+    np.clip(pert, 0.0, 100.0, out=pert)
+
+    out = coordinates_batch(pert.reshape(-1, d)).reshape(2 * d, n, 2)
+    plus, minus = out[0::2], out[1::2]                       # (d, n, 2)
+    delta = pert[0::2, :, :] - pert[1::2, :, :]              # (d, n, d) ; pas effectif après bornage
+    h = delta[np.arange(d), :, np.arange(d)]                 # (d, n)
+    jac = (plus - minus) / h[:, :, None]                     # (d, n, 2)
+
+    center = coordinates_batch(base)
+    cov = np.einsum("jni,nj,jnk->nik", jac, sigma ** 2, jac)
+    return center, cov
+
+
+def _monte_carlo(matrix: np.ndarray, sigma: np.ndarray, n_samples: int,
+                 rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    n, d = matrix.shape
+    base = matrix.astype(np.float64)
+
+    samples = base[None, :, :] + rng.standard_normal((n_samples, n, d)) * sigma[None, :, :]
+    np.clip(samples, 0.0, 100.0, out=samples)
+    xy = coordinates_batch(samples.reshape(-1, d)).reshape(n_samples, n, 2)
+
+    center = xy.mean(axis=0)
+    dev = xy - center[None, :, :]
+    cov = np.einsum("sni,snk->nik", dev, dev) / max(1, n_samples - 1)
+    return center, cov
+
+
+def propagate(matrix: np.ndarray, sigma: SigmaLike = 3.0, method: str = "linear",
+              n_samples: int = 256, step: float = 0.5,
+              seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Propage l'incertitude des 16 scores vers le plan (x, y).
+
+    matrix : (N, 16) scores 0..100 dans l'ordre de VARIABLES.
+    sigma  : écart-type en points de score (scalaire, (16,) ou (N, 16)).
+    Retourne (centres (N, 2), covariances (N, 2, 2)).
+    """
+    m = np.asarray(matrix)
+    if m.ndim != 2 or m.shape[1] != len(VARIABLES):
+        raise ValueError(f"Matrice de scores attendue de forme (N, {len(VARIABLES)}), reçu {m.shape}")
+    if method not in ("linear", "montecarlo"):
+        raise ValueError("method doit valoir 'linear' ou 'montecarlo'.")
+
+    n = m.shape[0]
+    sig = _sigma_matrix(sigma, n)
+    centers = np.empty((n, 2), dtype=np.float64)
+    covs = np.empty((n, 2, 2), dtype=np.float64)
+
+    per_row = 2 * len(VARIABLES) if method == "linear" else max(2, int(n_samples))
+    chunk = max(1, MAX_ROWS_PER_CALL // per_row)
+    rng = np.random.default_rng(seed)
+
+    for start in range(0, n, chunk):
+        sl = slice(start, min(n, start + chunk))
+        if method == "linear":
+            c, cv = _linear(m[sl], sig[sl], step)
+        else:
+            c, cv = _monte_carlo(m[sl], sig[sl], per_row, rng)
+        centers[sl] = c
+        covs[sl] = cv
+
+    return centers, covs
+
+
+def covariance_to_ellipse(cov: np.ndarray, n_std: float = 1.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Covariances (N, 2, 2) -> (largeur, hauteur, angle en degrés) des ellipses à n_std écarts-types,
+    au format attendu par matplotlib.patches.Ellipse.
+    """
+    eigval, eigvec = np.linalg.eigh(cov)                    # valeurs propres croissantes
+    eigval = np.clip(eigval, 0.0, None)
+    width = 2.0 * n_std * np.sqrt(eigval[:, 1])
+    height = 2.0 * n_std * np.sqrt(eigval[:, 0])
+    angle = np.degrees(np.arctan2(eigvec[:, 1, 1], eigvec[:, 0, 1]))
+    return width, height, angle